@@ -1,12 +1,42 @@
+import io
 import json
 import os
+import shutil
+import subprocess
+import sys
 import warnings
 from collections import defaultdict
+from pathlib import Path
 
 import numpy as np
+import pandas as pd
 import pytest
+import xarray as xr
 
 from zen_garden import Results, run
+from zen_garden.default_config import (
+    TimeSeriesAggregation as TimeSeriesAggregationSettings,
+)
+from zen_garden.model.component import Parameter
+from zen_garden.optimization_setup import OptimizationSetup
+from zen_garden.postprocess.postprocess import PostprocessWriter
+from zen_garden.preprocess.dataset_index import DatasetIndex
+from zen_garden.preprocess.element_data_cache import ElementDataCache
+from zen_garden.preprocess.extract_input_data import DataInput
+from zen_garden.preprocess.input_cache import InputCache
+from zen_garden.preprocess.model_cache import ModelCache
+from zen_garden.preprocess.time_series_aggregation import (
+    TimeSeriesAggregation,
+    aggregate_time_series,
+    aggregate_time_series_with_tsam,
+)
+from zen_garden.preprocess.unit_handling import UnitHandling
+from zen_garden.utils import ExpandedScenarios, ScenarioDict
+from zen_garden.wrapper.benchmark import (
+    BENCHMARK_PHASES,
+    compare_to_baseline,
+    run_benchmark,
+)
 from zen_garden.wrapper.operation_scenarios import operation_scenarios
 
 # fixtures
@@ -170,6 +200,37 @@ def test_1b(folder_path):
     compare_variables_results(data_set_name, res, folder_path)
 
 
+def test_1b_model_cache(folder_path, tmp_path, monkeypatch):
+    # run the test twice, the second run loads the model from the cache
+    data_set_name = "test_1b"
+    config_path = tmp_path / "config.json"
+    with open(config_path, "w") as f:
+        json.dump({"solver": {"keep_files": False, "use_model_cache": True}}, f)
+    # record whether the cache was hit
+    cache_hits = []
+    load = ModelCache.load
+
+    def load_and_record(self, config):
+        optimization_setup = load(self, config)
+        cache_hits.append(optimization_setup is not None)
+        return optimization_setup
+
+    monkeypatch.setattr(ModelCache, "load", load_and_record)
+    folder_output = str(tmp_path / "outputs")
+    for _ in range(2):
+        run(
+            config=str(config_path),
+            dataset=os.path.join(folder_path, data_set_name),
+            folder_output=folder_output,
+        )
+    assert cache_hits == [False, True]
+    assert len(os.listdir(os.path.join(folder_output, "model_cache"))) == 1
+
+    # read the results and check again
+    res = Results(os.path.join(folder_output, data_set_name))
+    compare_variables_results(data_set_name, res, folder_path)
+
+
 def test_1c(folder_path):
     # run the test
     data_set_name = "test_1c"
@@ -404,6 +465,36 @@ def test_3d(folder_path):
     check_get_total_get_full_ts(res, discount_to_first_step=False)
 
 
+def test_3b_tsa_cache(folder_path, tmp_path, monkeypatch):
+    # the second run reuses the time series aggregation from the solver directory
+    data_set_name = "test_3b"
+    config_path = tmp_path / "config.json"
+    with open(config_path, "w") as f:
+        json.dump({"solver": {"keep_files": False, "use_tsa_cache": True}}, f)
+    n_aggregations = []
+    aggregate = TimeSeriesAggregation.aggregate
+
+    def count_and_aggregate(self):
+        n_aggregations[-1] += 1
+        return aggregate(self)
+
+    monkeypatch.setattr(TimeSeriesAggregation, "aggregate", count_and_aggregate)
+    folder_output = str(tmp_path / "outputs")
+    for _ in range(2):
+        # start without the results in memory
+        monkeypatch.setattr(TimeSeriesAggregation, "_cached_results", {})
+        n_aggregations.append(0)
+        run(
+            config=str(config_path),
+            dataset=os.path.join(folder_path, data_set_name),
+            folder_output=folder_output,
+        )
+    assert n_aggregations[0] > 0
+    assert n_aggregations[1] == 0
+    res = Results(os.path.join(folder_output, data_set_name))
+    compare_variables_results(data_set_name, res, folder_path)
+
+
 def test_3e(folder_path):
     # run the test
     data_set_name = "test_3e"
@@ -421,6 +512,454 @@ def test_3e(folder_path):
     compare_variables_results(data_set_name, res, folder_path)
 
 
+def test_3e_trace(folder_path, tmp_path):
+    # run the rolling horizon test with diagnostics, which writes the trace
+    data_set_name = "test_3e"
+    config_path = tmp_path / "config.json"
+    with open(config_path, "w") as f:
+        json.dump({"solver": {"keep_files": False, "run_diagnostics": True}}, f)
+    run(
+        config=str(config_path),
+        dataset=os.path.join(folder_path, data_set_name),
+        folder_output=str(tmp_path / "outputs"),
+    )
+
+    # the trace is written once per scenario, not in every horizon step
+    trace_files = list((tmp_path / "outputs").rglob("trace.json"))
+    assert trace_files == [tmp_path / "outputs" / data_set_name / "trace.json"]
+    with open(trace_files[0]) as f:
+        trace = json.load(f)
+    phases = [span["name"] for span in trace["children"]]
+    assert phases[0] == "preprocess"
+    steps = [span for span in trace["children"] if span["name"].startswith("step_")]
+    assert len(steps) > 1
+
+    def get_spans(span):
+        yield span
+        for child in span["children"]:
+            yield from get_spans(child)
+
+    for step in steps:
+        assert {"construct", "solve", "postprocess"} <= {
+            span["name"] for span in step["children"]
+        }
+    spans = list(get_spans(trace))
+    balances = [s for s in spans if s["name"] == "constraint_nodal_energy_balance"]
+    assert len(balances) == len(steps)
+    for span in balances:
+        assert span["rows"] > 0 and span["nonzeros"] > span["rows"]
+        assert list(span["constraints"]) == ["constraint_nodal_energy_balance"]
+    # the constraint rules are reported sorted by their construction time
+    rules = pd.read_csv(
+        tmp_path / "outputs" / data_set_name / "constraint_rules.csv", index_col=0
+    )
+    assert rules["wall_time"].is_monotonic_decreasing
+    assert rules.loc["constraint_nodal_energy_balance", "rows"] == sum(
+        span["rows"] for span in balances
+    )
+    for span in spans:
+        assert span["wall_time"] >= 0
+        assert span["peak_rss"] >= span["rss_end"]
+        assert span["peak_rss"] >= max(
+            [child["peak_rss"] for child in span["children"]], default=0
+        )
+
+    res = Results(str(tmp_path / "outputs" / data_set_name))
+    compare_variables_results(data_set_name, res, folder_path)
+
+
+def test_3e_warm_start(folder_path, tmp_path, monkeypatch):
+    # run the rolling horizon test with each step warm started from the previous
+    data_set_name = "test_3e"
+    config_path = tmp_path / "config.json"
+    with open(config_path, "w") as f:
+        json.dump(
+            {
+                "solver": {
+                    "keep_files": False,
+                    "run_diagnostics": True,
+                    "warm_start": True,
+                }
+            },
+            f,
+        )
+    # check that the start values are within the (scaled) bounds of the model
+    write_warm_start_file = OptimizationSetup.write_warm_start_file
+    n_start_values = []
+
+    def write_and_check(self):
+        warmstart_fn = write_warm_start_file(self)
+        if warmstart_fn is None:
+            return None
+        with open(warmstart_fn) as f:
+            start = dict(
+                (int(line.split()[0][1:]), float(line.split()[1]))
+                for line in f
+                if line.startswith("x")
+            )
+        for name in self.model.variables:
+            var = self.model.variables[name]
+            labels = var.labels.values
+            lower = var.lower.broadcast_like(var.labels).values[labels != -1]
+            upper = var.upper.broadcast_like(var.labels).values[labels != -1]
+            values = np.array([start[label] for label in labels[labels != -1]])
+            tolerance = 1e-6 * np.maximum(1, np.abs(values))
+            assert (values >= lower - tolerance).all(), name
+            assert (values <= upper + tolerance).all(), name
+        n_start_values.append(len(start))
+        return warmstart_fn
+
+    monkeypatch.setattr(OptimizationSetup, "write_warm_start_file", write_and_check)
+    folder_output = tmp_path / "outputs"
+    run(
+        config=str(config_path),
+        dataset=os.path.join(folder_path, data_set_name),
+        folder_output=str(folder_output),
+    )
+    # all steps after the first are warm started
+    steps = sorted((folder_output / data_set_name).glob("MF_*"))
+    assert len(n_start_values) == len(steps) - 1
+    for step in steps:
+        with open(step / "benchmarking.json") as f:
+            benchmarking = json.load(f)
+        assert "solving_time" in benchmarking and "number_iterations" in benchmarking
+        if step.name == "MF_0":
+            assert "warm_start_share" not in benchmarking
+        else:
+            assert 0 < benchmarking["warm_start_share"] <= 1
+
+    res = Results(str(folder_output / data_set_name))
+    compare_variables_results(data_set_name, res, folder_path)
+
+
+def test_3e_postprocess_in_background(folder_path, tmp_path):
+    # run the rolling horizon test with the results written in the background
+    data_set_name = "test_3e"
+    config_path = tmp_path / "config.json"
+    with open(config_path, "w") as f:
+        json.dump(
+            {
+                "analysis": {"postprocess_in_background": True},
+                "solver": {"keep_files": False},
+            },
+            f,
+        )
+    run(
+        config=str(config_path),
+        dataset=os.path.join(folder_path, data_set_name),
+        folder_output=str(tmp_path / "outputs"),
+    )
+
+    # read the results and check again
+    res = Results(str(tmp_path / "outputs" / data_set_name))
+    compare_variables_results(data_set_name, res, folder_path)
+
+
+def test_postprocess_writer_error():
+    # a failing write is raised when the writer is joined
+    def write(name):
+        raise OSError(f"cannot write {name}")
+
+    written = []
+    writer = PostprocessWriter()
+    writer.submit(write, "var_dict")
+    writer.submit(written.append, "param_dict")
+    with pytest.raises(RuntimeError) as error:
+        writer.join()
+    assert isinstance(error.value.__cause__, OSError)
+    # the remaining files are skipped after an error
+    assert written == []
+    # the error is not raised if another error is in flight
+    writer = PostprocessWriter()
+    writer.submit(write, "var_dict")
+    writer.join(raise_error=False)
+
+
+def test_3e_parameter_cache(folder_path, tmp_path, monkeypatch):
+    # the parameters reused across the horizon steps equal a fresh conversion
+    data_set_name = "test_3e"
+    n_conversions = []
+    convert_to_xarr = Parameter.convert_to_xarr
+
+    def count_and_convert(self, *args, **kwargs):
+        n_conversions[-1] += 1
+        return convert_to_xarr(self, *args, **kwargs)
+
+    monkeypatch.setattr(Parameter, "convert_to_xarr", count_and_convert)
+    parameters = []
+    for use_cache in [True, False]:
+        if not use_cache:
+            monkeypatch.setattr(Parameter, "get_fingerprint", lambda *args: None)
+        n_conversions.append(0)
+        optimization_setup = run(
+            config=os.path.join(folder_path, "config.json"),
+            dataset=os.path.join(folder_path, data_set_name),
+            folder_output=str(tmp_path / f"outputs_{use_cache}"),
+        )
+        parameters.append(optimization_setup.parameters)
+    # some parameters are reused in the later steps
+    assert n_conversions[0] < n_conversions[1]
+    cached, fresh = parameters
+    assert cached.docs.keys() == fresh.docs.keys()
+    for name in fresh.docs:
+        xr.testing.assert_identical(
+            xr.DataArray(getattr(cached, name)), xr.DataArray(getattr(fresh, name))
+        )
+        # the units are strings or pandas objects
+        units, fresh_units = cached.units[name], fresh.units[name]
+        if hasattr(fresh_units, "equals"):
+            assert units.equals(fresh_units), name
+        else:
+            assert units == fresh_units, name
+
+
+def test_4a_reuse_element_input_data(folder_path, tmp_path, monkeypatch):
+    # the scenarios reuse the input data of the elements they do not change
+    data_set_name = "test_4a"
+    dataset = tmp_path / data_set_name
+    shutil.copytree(os.path.join(folder_path, data_set_name), dataset)
+    with open(dataset / "scenarios.json", "w") as f:
+        json.dump(
+            {
+                "1": {
+                    "natural_gas_boiler": {
+                        "capex_specific_conversion": {"default_op": 1.1}
+                    }
+                },
+                "2": {"heat": {"demand": {"file": "demand_1", "file_op": 2}}},
+            },
+            f,
+        )
+    n_reused = []
+    load = ElementDataCache.load
+
+    def count_and_load(self, element):
+        is_reused = load(self, element)
+        n_reused[-1] += is_reused
+        return is_reused
+
+    monkeypatch.setattr(ElementDataCache, "load", count_and_load)
+    parameters = []
+    for reuse in [True, False]:
+        monkeypatch.setattr(ElementDataCache, "_snapshots", {})
+        config_path = tmp_path / "config.json"
+        with open(config_path, "w") as f:
+            json.dump(
+                {"solver": {"keep_files": False, "reuse_element_input_data": reuse}},
+                f,
+            )
+        n_reused.append(0)
+        optimization_setup = run(
+            config=str(config_path),
+            dataset=str(dataset),
+            folder_output=str(tmp_path / f"outputs_{reuse}"),
+        )
+        parameters.append(optimization_setup.parameters)
+    n_elements = len(optimization_setup.dict_elements["Element"])
+    # the first scenario reads all elements, the others all but one
+    assert n_reused == [2 * (n_elements - 1), 0]
+    reused, fresh = parameters
+    assert reused.docs.keys() == fresh.docs.keys()
+    for name in fresh.docs:
+        xr.testing.assert_identical(
+            xr.DataArray(getattr(reused, name)), xr.DataArray(getattr(fresh, name))
+        )
+
+
+def test_benchmark(tmp_path):
+    # run the benchmark on a small synthetic dataset
+    size = {
+        "n_nodes": 2,
+        "n_edges": 2,
+        "n_conversion_technologies": 2,
+        "n_time_steps": 8,
+        "n_aggregated_time_steps": 4,
+    }
+    results = run_benchmark(tmp_path, [size])
+    assert results["optimal"].all()
+    assert list(results["phase"]) == BENCHMARK_PHASES
+    assert (tmp_path / "benchmark.csv").exists()
+    # compare to a faster and a slower baseline
+    baseline = results.copy()
+    baseline["wall_time"] *= 2
+    assert not compare_to_baseline(results, baseline)["regression"].any()
+    baseline["wall_time"] /= 4
+    assert compare_to_baseline(results, baseline)["regression"].all()
+
+
+def test_dataset_index(tmp_path):
+    # the index lists a folder once and again only after it changed
+    folder = tmp_path / "element"
+    folder.mkdir()
+    for file_name in ["attributes.json", "demand.csv", "demand_2023.csv"]:
+        (folder / file_name).touch()
+    index = DatasetIndex(tmp_path)
+    assert index.list_folders(tmp_path) == ["element"]
+    assert index.has_file(folder, "demand.csv")
+    assert not index.has_file(folder, "demand_2024.csv")
+    years = ["2022", "2023", "2024"]
+    assert index.get_year_specific_files(folder, "demand", years) == {
+        1: "demand_2023"
+    }
+    # add a file and make sure that the modification time of the folder changes
+    (folder / "demand_2024.csv").touch()
+    mtime = os.stat(folder).st_mtime_ns
+    os.utime(folder, ns=(mtime, mtime + 1))
+    assert index.has_file(folder, "demand_2024.csv")
+    assert index.get_year_specific_files(folder, "demand", years) == {
+        1: "demand_2023",
+        2: "demand_2024",
+    }
+    assert DatasetIndex.get(tmp_path) is DatasetIndex.get(str(tmp_path) + "/")
+
+
+def test_input_cache(tmp_path):
+    # the csv file is parsed again only if its content changed
+    path = tmp_path / "demand.csv"
+    path.write_text("node,demand\nCH,1\nDE,2\n")
+    parsed = []
+
+    def reader(file):
+        parsed.append(file)
+        return pd.read_csv(file)
+
+    cache = InputCache(tmp_path / "solver_dir")
+    df = cache.read_csv(path, reader)
+    pd.testing.assert_frame_equal(cache.read_csv(path, reader), df)
+    assert len(parsed) == 1
+    # touch the file without changing it
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    pd.testing.assert_frame_equal(cache.read_csv(path, reader), df)
+    assert len(parsed) == 1
+    # change the file
+    path.write_text("node,demand\nCH,3\nDE,2\n")
+    assert cache.read_csv(path, reader)["demand"].tolist() == [3, 2]
+    assert len(parsed) == 2
+
+
+def test_unit_conversion_cache(folder_path, monkeypatch):
+    # the unit registry and the unit conversions are shared between scenarios
+    unit_folder = Path(folder_path) / "test_1a" / "energy_system"
+    unit_handling = UnitHandling(unit_folder, 6)
+    multiplier, unit = unit_handling.convert_unit_into_base_units(
+        "kEuro/MWh", get_multiplier=True, attribute_name="price_import"
+    )
+    # a second scenario reuses the conversion without recalculating it
+    monkeypatch.setattr(UnitHandling, "_calculate_combined_unit", None)
+    other_unit_handling = UnitHandling(unit_folder, 6)
+    assert other_unit_handling.ureg is unit_handling.ureg
+    assert other_unit_handling.convert_unit_into_base_units(
+        "kEuro/MWh", get_multiplier=True, attribute_name="price_import"
+    ) == (multiplier, unit)
+
+
+def test_yearly_interpolation():
+    # the vectorized interpolation equals the interpolation of pandas
+    index = pd.MultiIndex.from_product(
+        [["CH", "DE", "FR"], [2022, 2023, 2025, 2026, 2030]], names=["node", "year"]
+    )
+    values = [np.nan, 1.0, np.nan, 4.0, np.nan]
+    values += [2.0, np.nan, np.nan, np.nan, 7.0]
+    values += [np.nan] * 5
+    df = pd.DataFrame({"value": values}, index=index)
+    expected = df["value"].unstack("node").interpolate(method="index", axis=0)
+    result = DataInput._interpolate_yearly(df, "year")["value"].unstack("node")
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+def test_numpy_tsa_backend(folder_path, tmp_path):
+    # the numpy backend represents distinct profiles exactly and keeps the mean
+    time_steps = np.arange(240)
+    df = pd.DataFrame(
+        {
+            "demand": np.tile([1.0, 2.0, 5.0, 3.0], 60),
+            "solar": np.tile([0.0, 0.5, 1.0, 0.5], 60),
+        }
+    )
+    tsa_settings = TimeSeriesAggregationSettings(
+        backend="numpy", clusterMethod="k_means"
+    )
+    result = aggregate_time_series(df, 4, tsa_settings)
+    assert sum(result["cluster_period_no_occur"].values()) == len(time_steps)
+    assert (result["accuracy_indicators"]["RMSE"] == 0).all()
+    predicted = result["typical_periods"].to_numpy()[result["cluster_order"]]
+    np.testing.assert_allclose(predicted, df.to_numpy())
+    df["demand"] += np.sin(time_steps)
+    for cluster_method in ["k_means", "k_medoids"]:
+        tsa_settings = TimeSeriesAggregationSettings(
+            backend="numpy",
+            clusterMethod=cluster_method,
+            extremePeriodMethod="new_cluster_center",
+            rescaleClusterPeriods=True,
+        )
+        result = aggregate_time_series(df, 6, tsa_settings)
+        typical_periods = result["typical_periods"]
+        assert len(typical_periods) == len(result["cluster_period_idx"]) <= 6
+        # the peaks are preserved
+        assert np.allclose(typical_periods.max(), df.max())
+        predicted = typical_periods.to_numpy()[result["cluster_order"]]
+        np.testing.assert_allclose(predicted.mean(axis=0), df.mean(), rtol=1e-5)
+    # the backend runs in the model
+    data_set_name = "test_3b"
+    config_path = tmp_path / "config.json"
+    with open(config_path, "w") as f:
+        json.dump(
+            {
+                "solver": {"keep_files": False},
+                "analysis": {
+                    "time_series_aggregation": {
+                        "backend": "numpy",
+                        "clusterMethod": "k_means",
+                    }
+                },
+            },
+            f,
+        )
+    optimization_setup = run(
+        config=str(config_path),
+        dataset=os.path.join(folder_path, data_set_name),
+        folder_output=str(tmp_path / "outputs"),
+    )
+    assert optimization_setup.optimality
+
+
+def test_tsa_duplicate_time_series():
+    # identical time series are clustered once without changing the aggregation
+    rng = np.random.default_rng(0)
+    profiles = rng.random((200, 3))
+    df = pd.DataFrame(profiles[:, [0, 1, 0, 2, 0, 1]], columns=list("abcdef"))
+    tsa_settings = TimeSeriesAggregationSettings()
+    result = aggregate_time_series(df, 10, tsa_settings)
+    expected = aggregate_time_series_with_tsam(df.copy(), 10, tsa_settings)
+    np.testing.assert_array_equal(result["cluster_order"], expected["cluster_order"])
+    pd.testing.assert_frame_equal(
+        result["typical_periods"], expected["typical_periods"][df.columns]
+    )
+    assert list(result["accuracy_indicators"].index) == list(df.columns)
+
+
+def test_import_time():
+    # importing zen_garden must not import the heavy dependencies
+    heavy_modules = ["linopy", "xarray", "pint", "tsam", "sklearn", "tables"]
+    code = (
+        "import sys, time; start = time.perf_counter(); import zen_garden; "
+        "print(time.perf_counter() - start); "
+        f"print([m for m in {heavy_modules} if m in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    assert output[1] == "[]", f"zen_garden imports {output[1]}"
+    # generous budget, the import takes a few milliseconds
+    assert float(output[0]) < 1.0
+    # the lazy attributes are still available
+    import zen_garden
+
+    assert zen_garden.run is run
+    assert "StorageTechnology" in OptimizationSetup.dict_element_classes
+
+
 def test_3f(folder_path):
     # run the test
     data_set_name = "test_3f"
@@ -486,6 +1025,31 @@ def test_3i(folder_path):
     check_get_total_get_full_ts(res)
 
 
+def test_3i_parallel_preprocessing(folder_path, tmp_path):
+    # read the input data of the elements in parallel threads and aggregate the
+    # year-specific time series in parallel processes
+    data_set_name = "test_3i"
+    config_path = tmp_path / "config.json"
+    with open(config_path, "w") as f:
+        json.dump(
+            {
+                "solver": {
+                    "keep_files": False,
+                    "n_input_workers": 4,
+                    "n_tsa_workers": 2,
+                }
+            },
+            f,
+        )
+    run(
+        config=str(config_path),
+        dataset=os.path.join(folder_path, data_set_name),
+        folder_output=str(tmp_path / "outputs"),
+    )
+    res = Results(str(tmp_path / "outputs" / data_set_name))
+    compare_variables_results(data_set_name, res, folder_path)
+
+
 def test_4a(folder_path):
     # run the test
     data_set_name = "test_4a"
@@ -502,6 +1066,26 @@ def test_4a(folder_path):
     check_get_total_get_full_ts(res)
 
 
+def test_4d_lazy_scenario_expansion(folder_path):
+    # the lazy expansion creates the same scenarios and scenarios.json as the
+    # expansion of the full product
+    with open(os.path.join(folder_path, "test_4d", "scenarios.json")) as f:
+        scenarios = json.load(f)
+    scenarios["2"] = {"heat": {"demand": {"default": [[1.0], [2.0]]}}}
+    expanded = ScenarioDict.expand_lists(json.loads(json.dumps(scenarios)))
+    lazy = ExpandedScenarios(scenarios)
+    assert len(lazy) == len(expanded)
+    assert list(lazy) == list(expanded)
+    for position, (name, scenario) in enumerate(expanded.items()):
+        assert lazy.get_name(position) == name
+        assert lazy.get_scenario(position) == scenario
+        assert lazy[name] == scenario
+    assert lazy.get_name(-1) == list(expanded)[-1]
+    file = io.StringIO()
+    lazy.write_json(file)
+    assert file.getvalue() == json.dumps(expanded, indent=2)
+
+
 def test_4b(folder_path):
     # run the test
     data_set_name = "test_4b"
@@ -518,6 +1102,23 @@ def test_4b(folder_path):
     check_get_total_get_full_ts(res, specific_scenario=True)
 
 
+def test_4b_parallel(folder_path, tmp_path):
+    # run the test with the scenarios solved in parallel processes
+    data_set_name = "test_4b"
+    folder_output = str(tmp_path / "outputs")
+    scenario_status = run(
+        config=os.path.join(folder_path, "config.json"),
+        dataset=os.path.join(folder_path, data_set_name),
+        folder_output=folder_output,
+        n_workers=2,
+    )
+    assert all(status["status"] == "optimal" for status in scenario_status.values())
+
+    # read the results and check again
+    res = Results(os.path.join(folder_output, data_set_name))
+    compare_variables_results(data_set_name, res, folder_path)
+
+
 def test_4c(folder_path):
     # run the test
     data_set_name = "test_4c"
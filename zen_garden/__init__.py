@@ -1,17 +1,20 @@
 import importlib
-import pkgutil
-
-from . import model, wrapper
-from .model.element import Element
-from .optimization_setup import OptimizationSetup
-from .postprocess.comparisons import (
-    compare_configs,
-    compare_dicts,
-    compare_model_values,
-)
-from .postprocess.results.results import Results
-from .runner import run
-from .utils import download_example_dataset, get_inheritors
+
+# the submodules are imported when their attributes are first accessed, so that
+# importing zen_garden and starting the command line interfaces is fast
+_lazy_attributes = {
+    "run": "zen_garden.runner",
+    "Results": "zen_garden.postprocess.results.results",
+    "download_example_dataset": "zen_garden.utils",
+    "get_inheritors": "zen_garden.utils",
+    "compare_configs": "zen_garden.postprocess.comparisons",
+    "compare_dicts": "zen_garden.postprocess.comparisons",
+    "compare_model_values": "zen_garden.postprocess.comparisons",
+    "OptimizationSetup": "zen_garden.optimization_setup",
+    "Element": "zen_garden.model.element",
+    "inheritors": "zen_garden.optimization_setup",
+}
+_lazy_submodules = ["model", "wrapper"]
 
 __all__ = [
     "run",
@@ -24,11 +27,26 @@ __all__ = [
     "wrapper",
 ]
 
-for _, module, _ in pkgutil.walk_packages(model.__path__, prefix=f"{model.__name__}."):
-    importlib.import_module(module)
 
-# set the element classes of the EnergySystem class
-inheritors = get_inheritors(Element)
-OptimizationSetup.dict_element_classes.update(
-    {klass.__name__: klass for klass in inheritors}
-)
+def __getattr__(name):
+    """Imports the attributes of the package when they are first accessed.
+
+    :param name: name of the attribute
+    :return: the attribute
+    """
+    if name in _lazy_attributes:
+        value = getattr(importlib.import_module(_lazy_attributes[name]), name)
+    elif name in _lazy_submodules:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Lists the attributes of the package including the lazy ones.
+
+    :return: sorted list of attribute names
+    """
+    return sorted(set(globals()) | set(_lazy_attributes) | set(_lazy_submodules))
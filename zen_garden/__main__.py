@@ -5,7 +5,6 @@ Compilation  of the optimization problem.
 import warnings
 
 from .cli.zen_garden_cli import create_zen_garden_cli
-from .runner import run
 
 
 def run_module(config="./config.py", dataset=None, folder_output=None, job_index=None):
@@ -56,6 +55,8 @@ def run_module(config="./config.py", dataset=None, folder_output=None, job_index
         stacklevel=2,
     )
 
+    from .runner import run
+
     # run
     return run(
         config=config, dataset=dataset, folder_output=folder_output, job_index=job_index
@@ -1,8 +1,6 @@
 import argparse
 import sys
 
-from zen_garden.utils import download_example_dataset
-
 
 def create_zen_example_cli():
     """Entry point for the `zen-example` command-line interface.
@@ -44,4 +42,6 @@ def create_zen_example_cli():
     args = parser.parse_args(sys.argv[1:])
 
     # download the example
+    from zen_garden.utils import download_example_dataset
+
     download_example_dataset(args.dataset)
@@ -1,8 +1,6 @@
 import argparse
 import os
 
-from zen_garden.runner import run
-
 
 # ---------------------------------------------------------------------------
 # Command-line interface
@@ -38,6 +36,10 @@ def build_parser() -> argparse.ArgumentParser:
             Name of the environment variable containing the job index.
             Defaults to ``SLURM_ARRAY_TASK_ID``.
 
+        --n_workers (int, optional):
+            Number of processes used to solve the scenarios in parallel.
+            Overrides ``config.system.n_parallel_scenarios``.
+
     Returns:
         argparse.ArgumentParser: An argument parser configured for the
         ZEN-Garden command-line interface.
@@ -90,6 +92,14 @@ def build_parser() -> argparse.ArgumentParser:
         default="SLURM_ARRAY_TASK_ID",
         help="Environment variable for job index.",
     )
+    parser.add_argument(
+        "--n_workers",
+        type=int,
+        required=False,
+        default=None,
+        help="Number of processes to solve the scenarios in parallel. Overrides "
+        "config.system.n_parallel_scenarios.",
+    )
 
     return parser
 
@@ -156,6 +166,10 @@ def create_zen_garden_cli():
             Name of the environment variable containing the job index.
             Defaults to ``SLURM_ARRAY_TASK_ID``.
 
+        --n_workers (int, optional):
+            Number of processes used to solve the scenarios in parallel.
+            Overrides ``config.system.n_parallel_scenarios``.
+
     Returns:
         None
 
@@ -173,9 +187,13 @@ def create_zen_garden_cli():
     ### get the job index
     job_index = resolve_job_index(args.job_index, args.job_index_var)
 
+    # import the runner only after parsing, so that --help is fast
+    from zen_garden.runner import run
+
     run(
         config=args.config,
         dataset=args.dataset,
         folder_output=args.folder_output,
         job_index=job_index,
+        n_workers=args.n_workers,
     )
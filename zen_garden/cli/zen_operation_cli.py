@@ -1,7 +1,6 @@
 import argparse
 
 from zen_garden.cli.zen_garden_cli import build_parser, resolve_job_index
-from zen_garden.wrapper.operation_scenarios import operation_scenarios
 
 
 def build_parser_op() -> argparse.ArgumentParser:
@@ -75,6 +74,8 @@ def create_zen_operation_cli() -> None:
     job_index = resolve_job_index(args.job_index, args.job_index_var)
 
     # run operation scenarios
+    from zen_garden.wrapper.operation_scenarios import operation_scenarios
+
     operation_scenarios(
         config=args.config,
         dataset=args.dataset,
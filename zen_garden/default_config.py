@@ -138,6 +138,7 @@ class System(Subscriptable):
     conduct_scenario_analysis: bool = False
     run_default_scenario: bool = True
     clean_sub_scenarios: bool = False
+    n_parallel_scenarios: int = 1  # number of processes to solve scenarios in parallel
     total_hours_per_year: int = 8760
     knowledge_depreciation_rate: float = 0.1
     reference_year: int = 2024
@@ -183,6 +184,13 @@ class Solver(Subscriptable):
     rounding_decimal_points_tsa: int = 4
     analyze_numerics: bool = True
     run_diagnostics: bool = False
+    warm_start: bool = False  # warm start from the previous solution
+    use_model_cache: bool = False  # cache constructed models in solver_dir
+    use_input_cache: bool = False  # cache parsed csv input files in solver_dir
+    n_input_workers: int = 1  # threads that read the input data of the elements
+    use_tsa_cache: bool = False  # cache time series aggregations in solver_dir
+    n_tsa_workers: int = 1  # processes that aggregate the year-specific time series
+    reuse_element_input_data: bool = False  # reuse unchanged elements in scenarios
     use_scaling: bool = True
     scaling_include_rhs: bool = True
     scaling_algorithm: Union[list[str], str] = ["geom", "geom", "geom"]
@@ -201,6 +209,9 @@ class TimeSeriesAggregation(Subscriptable):
     rescaleClusterPeriods: bool = False
     representationMethod: str = "meanRepresentation"
     resolution: int = 1
+    backend: Literal["tsam", "numpy"] = "tsam"  # numpy supports k_means, k_medoids
+    maxIterations: int = 100  # iterations of the numpy k-means and k-medoids
+    batchSize: Optional[int] = None  # mini-batch size of the numpy k-means
 
 
 class Analysis(Subscriptable):
@@ -218,6 +229,7 @@ class Analysis(Subscriptable):
     folder_output: str = "./outputs/"
     overwrite_output: bool = True
     output_format: str = "h5"
+    postprocess_in_background: bool = False
     earliest_year_of_data: int = 1900
     zen_garden_version: str = None
 
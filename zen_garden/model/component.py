@@ -4,6 +4,7 @@ significant overhead. Indexing within ZEN-garden is also defined here.
 """
 
 import copy
+import hashlib
 import itertools
 import logging
 import uuid
@@ -484,6 +485,8 @@ class Parameter(Component):
         self.max_parameter_value = {"name": None, "value": None}
         self.dict_parameters = DictParameter()
         self.units = {}
+        # converted parameters of the previous rolling horizon step
+        self.cache = optimization_setup.parameter_cache
 
     def add_parameter(
         self,
@@ -526,9 +529,18 @@ class Parameter(Component):
             data, index_list = self.get_index_names_data(data)
             # save if highest or lowest value
             self.save_min_max(data, name)
-            # convert to arr and dict
-            xr_data = self.convert_to_xarr(copy.copy(data), index_list)
-            dict_data = self.convert_to_dict(data)
+            # reuse the converted parameter if unchanged since the last horizon step
+            fingerprint = self.get_fingerprint(data, index_list)
+            cached = self.cache.get(name) if fingerprint is not None else None
+            if cached is not None and cached[0] == fingerprint:
+                _, xr_data, dict_data, units = cached
+            else:
+                # convert to arr and dict
+                xr_data = self.convert_to_xarr(copy.copy(data), index_list)
+                dict_data = self.convert_to_dict(data)
+                units = self.get_param_units(data, dict_of_units, index_list, name)
+                if fingerprint is not None:
+                    self.cache[name] = (fingerprint, xr_data, dict_data, units)
             # set parameter
             setattr(self, name, xr_data)
             self.dict_parameters.add_param(name, dict_data)
@@ -536,9 +548,7 @@ class Parameter(Component):
             # save additional parameters
             self.docs[name] = self.compile_doc_string(doc, index_list, name)
             # save parameter units
-            self.units[name] = self.get_param_units(
-                data, dict_of_units, index_list, name
-            )
+            self.units[name] = units
         else:
             logging.warning(f"Parameter {name} already added. Can only be added once")
 
@@ -605,6 +615,35 @@ class Parameter(Component):
                 self.min_parameter_value["name"] = idxmin
                 self.min_parameter_value["value"] = valmin
 
+    def get_fingerprint(self, data, index_list):
+        """Returns a fingerprint of the parameter data and of the sets it is aligned to.
+
+        The fingerprint is used to reuse the converted parameter across the steps
+        of the rolling horizon. Parameters that change between the steps, e.g., the
+        existing capacities or the steps' time window, get a new fingerprint.
+
+        :param data: non default data of parameter
+        :param index_list: list of index names
+        :return: fingerprint of the parameter, None if the parameter is not cached
+        """
+        if self.cache is None or not isinstance(data, pd.Series) or data.empty:
+            return None
+        try:
+            data_hash = pd.util.hash_pandas_object(data).values
+        except TypeError:
+            return None
+        coords = self.index_sets.coords_dataset
+        coords_hash = tuple(
+            tuple(coords[index_name].values.tolist())
+            for index_name in index_list
+            if index_name in coords.dims
+        )
+        return (
+            hashlib.sha1(data_hash.tobytes()).hexdigest(),
+            tuple(index_list),
+            coords_hash,
+        )
+
     @staticmethod
     def get_param_units(data, dict_of_units, index_list, name):
         """Creates series of units with identical multi-index as data has.
@@ -899,6 +938,25 @@ class Constraint(Component):
         else:
             logging.warning(f"{name} already added. Can only be added once")
 
+    def get_statistics(self, names):
+        """Returns the size of constraints in the model.
+
+        :param names: names of the constraints
+        :return: dictionary with the number of rows, nonzero terms and bytes of each
+            constraint
+        """
+        statistics = {}
+        for name in names:
+            constraint = self.model.constraints[name]
+            rows = constraint.labels != -1
+            terms = (constraint.vars != -1) & (constraint.coeffs != 0) & rows
+            statistics[name] = {
+                "rows": int(rows.sum()),
+                "nonzeros": int(terms.sum()),
+                "nbytes": int(constraint.data.nbytes),
+            }
+        return statistics
+
     def add_single_constraint(self, name, constraint):
         """Adds a single constraint to the model.
 
@@ -4,15 +4,14 @@ optimization problem. Parent class of the Carrier and Technology classes.
 The class takes the concrete optimization model as an input.
 """
 
+import functools
 import itertools
 import logging
-import os
 import time
 from pathlib import Path
 
 import linopy as lp
 import pandas as pd
-import psutil
 import xarray as xr
 from linopy.expressions import LinearExpression
 
@@ -88,41 +87,31 @@ class Element:
         :param optimization_setup: The OptimizationSetup the element is part of
         """
         logging.info("\n--- Construct model components ---\n")
-        pid = os.getpid()
-        # construct Sets
+        tracer = optimization_setup.tracer
+        components = {
+            "Sets": cls.construct_sets,
+            "Params": cls.construct_params,
+            "Vars": cls.construct_vars,
+            "Constraints": cls.construct_constraints,
+        }
         t_start = time.perf_counter()
-        cls.construct_sets(optimization_setup)
-        t1 = time.perf_counter()
-        if optimization_setup.solver.run_diagnostics:
-            logging.info(f"Time to construct Sets: {t1 - t_start:0.1f} seconds")
-            mem_usage = psutil.Process(pid).memory_info().rss / 1024**2
-            logging.info(f"Memory usage: {mem_usage:0.1f} MB")
-        # construct Params
-        t0 = time.perf_counter()
-        cls.construct_params(optimization_setup)
-        t1 = time.perf_counter()
-        if optimization_setup.solver.run_diagnostics:
-            logging.info(f"Time to construct Params: {t1 - t0:0.1f} seconds")
-            mem_usage = psutil.Process(pid).memory_info().rss / 1024**2
-            logging.info(f"Memory usage: {mem_usage:0.1f} MB")
-        # construct Vars
-        t0 = time.perf_counter()
-        cls.construct_vars(optimization_setup)
-        t1 = time.perf_counter()
-        if optimization_setup.solver.run_diagnostics:
-            logging.info(f"Time to construct Vars: {t1 - t0:0.1f} seconds")
-            mem_usage = psutil.Process(pid).memory_info().rss / 1024**2
-            logging.info(f"Memory usage: {mem_usage:0.1f} MB")
-        # construct Constraints
-        t0 = time.perf_counter()
-        cls.construct_constraints(optimization_setup)
-        t1 = time.perf_counter()
+        for component, construct in components.items():
+            with tracer.span(component.lower()) as span:
+                construct(optimization_setup)
+            if optimization_setup.solver.run_diagnostics:
+                logging.info(
+                    f"Time to construct {component}: {span['wall_time']:0.1f} seconds"
+                )
+                logging.info(f"Memory usage: {span['rss_end']:0.1f} MB")
         if optimization_setup.solver.run_diagnostics:
-            logging.info(f"Time to construct Constraints: {t1 - t0:0.1f} seconds")
-            mem_usage = psutil.Process(pid).memory_info().rss / 1024**2
-            logging.info(f"Memory usage: {mem_usage:0.1f} MB")
+            rule_report = tracer.get_rule_report(span)
+            logging.info(
+                "Constraint rules with the longest construction time:\n"
+                f"{rule_report.drop(columns='constraints').head(10).to_string()}"
+            )
         # construct Objective
-        optimization_setup.energy_system.construct_objective()
+        with tracer.span("objective"):
+            optimization_setup.energy_system.construct_objective()
         if optimization_setup.solver.run_diagnostics:
             logging.info(
                 f"Total time to construct model components: "
@@ -137,10 +126,12 @@ class Element:
         """
         logging.info("Construct Sets")
         # construct Sets of energy system
-        optimization_setup.energy_system.construct_sets()
+        with optimization_setup.tracer.span("EnergySystem"):
+            optimization_setup.energy_system.construct_sets()
         # construct Sets of the child classes
         for subclass in cls.__subclasses__():
-            subclass.construct_sets(optimization_setup)
+            with optimization_setup.tracer.span(subclass.__name__):
+                subclass.construct_sets(optimization_setup)
 
     @classmethod
     def construct_params(cls, optimization_setup):
@@ -150,10 +141,12 @@ class Element:
         """
         logging.info("Construct Params")
         # construct Params of energy system
-        optimization_setup.energy_system.construct_params()
+        with optimization_setup.tracer.span("EnergySystem"):
+            optimization_setup.energy_system.construct_params()
         # construct Params of the child classes
         for subclass in cls.__subclasses__():
-            subclass.construct_params(optimization_setup)
+            with optimization_setup.tracer.span(subclass.__name__):
+                subclass.construct_params(optimization_setup)
 
     @classmethod
     def construct_vars(cls, optimization_setup):
@@ -163,10 +156,12 @@ class Element:
         """
         logging.info("Construct Vars")
         # construct Vars of energy system
-        optimization_setup.energy_system.construct_vars()
+        with optimization_setup.tracer.span("EnergySystem"):
+            optimization_setup.energy_system.construct_vars()
         # construct Vars of the child classes
         for subclass in cls.__subclasses__():
-            subclass.construct_vars(optimization_setup)
+            with optimization_setup.tracer.span(subclass.__name__):
+                subclass.construct_vars(optimization_setup)
 
     @classmethod
     def construct_constraints(cls, optimization_setup):
@@ -176,11 +171,13 @@ class Element:
         """
         logging.info("Construct Constraints")
         # construct Constraints of energy system
-        optimization_setup.energy_system.construct_constraints()
+        with optimization_setup.tracer.span("EnergySystem"):
+            optimization_setup.energy_system.construct_constraints()
         # construct Constraints of the child classes
         for subclass in cls.__subclasses__():
             logging.info(f"Construct Constraints of {subclass.__name__}")
-            subclass.construct_constraints(optimization_setup)
+            with optimization_setup.tracer.span(subclass.__name__):
+                subclass.construct_constraints(optimization_setup)
 
     @classmethod
     def create_custom_set(cls, list_index, optimization_setup):
@@ -391,6 +388,43 @@ class GenericRule(object):
     other rules of the technologies and carriers.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        """Traces the constraint rules of the subclasses.
+
+        :param kwargs: keyword arguments of the subclass
+        """
+        super().__init_subclass__(**kwargs)
+        for name, method in list(vars(cls).items()):
+            if name.startswith("constraint_") and callable(method):
+                setattr(cls, name, cls._traced_rule(name, method))
+
+    @staticmethod
+    def _traced_rule(name, method):
+        """Wraps a constraint rule in a span of the tracer.
+
+        If ``run_diagnostics`` is set, the span also stores the constraints added by
+        the rule with their number of rows, nonzero terms and bytes.
+
+        :param name: name of the constraint rule
+        :param method: constraint rule
+        :return: wrapped constraint rule
+        """
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            n_constraints = len(self.model.constraints)
+            with self.optimization_setup.tracer.span(name) as span:
+                result = method(self, *args, **kwargs)
+            if self.optimization_setup.solver.run_diagnostics:
+                added = list(self.model.constraints)[n_constraints:]
+                statistics = self.constraints.get_statistics(added)
+                for key in ["rows", "nonzeros", "nbytes"]:
+                    span[key] = sum(stats[key] for stats in statistics.values())
+                span["constraints"] = statistics
+            return result
+
+        return wrapper
+
     def __init__(self, optimization_setup):
         """Constructor for generic rule.
 
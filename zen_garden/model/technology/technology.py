@@ -1084,7 +1084,8 @@ class Technology(Element):
         # add pe.Constraints of the child classes
         for subclass in cls.__subclasses__():
             logging.info(f"Construct Constraints of {subclass.__name__}")
-            subclass.construct_constraints(optimization_setup)
+            with optimization_setup.tracer.span(subclass.__name__):
+                subclass.construct_constraints(optimization_setup)
 
     @classmethod
     def _technology_installation_mask(cls, optimization_setup):
@@ -8,22 +8,35 @@ solve the optimization problem.
 """
 
 import copy
+import importlib
 import logging
 import os
+import pkgutil
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import linopy as lp
 import numpy as np
 import pandas as pd
 
+from zen_garden import model
 from zen_garden.model.component import Constraint, IndexSet, Parameter, Variable
 from zen_garden.model.element import Element
 from zen_garden.model.energy_system import EnergySystem
 from zen_garden.model.technology.technology import Technology
+from zen_garden.preprocess.dataset_index import DatasetIndex
+from zen_garden.preprocess.element_data_cache import ElementDataCache
 from zen_garden.preprocess.parameter_change_log import parameter_change_log
 from zen_garden.preprocess.time_series_aggregation import TimeSeriesAggregation
 from zen_garden.preprocess.unit_handling import Scaling
-from zen_garden.utils import IISConstraintParser, ScenarioDict, StringUtils
+from zen_garden.utils import (
+    IISConstraintParser,
+    ScenarioDict,
+    StringUtils,
+    Tracer,
+    get_inheritors,
+)
 
 
 class OptimizationSetup(object):
@@ -39,7 +52,7 @@ class OptimizationSetup(object):
     # dict of element classes, this dict is filled in the __init__ of the package
     dict_element_classes = {}
 
-    def __init__(self, config, scenario_dict: dict, input_data_checks):
+    def __init__(self, config, scenario_dict: dict, input_data_checks, tracer=None):
         """Setup optimization of the energy system.
 
         This function sets up the optimization process for the energy system
@@ -52,8 +65,12 @@ class OptimizationSetup(object):
                 data such as resources, demand, etc.
             input_data_checks (InputDataChecks): Input data checks object to
                 verify the integrity of the input data.
+            tracer (Tracer | None): Tracer that records the timing and memory of
+                the phases. If None, a new tracer is created.
 
         """
+        # tracer of the wall time, CPU time and memory usage of the phases
+        self.tracer = tracer if tracer is not None else Tracer("optimization_setup")
         self.analysis = copy.deepcopy(config.analysis)
         self.system = copy.deepcopy(config.system)
         self.solver = copy.deepcopy(config.solver)
@@ -78,6 +95,11 @@ class OptimizationSetup(object):
         self.parameters = None
         self.constraints = None
         self.sets = None
+        # converted parameters, reused across the steps of the rolling horizon
+        self.parameter_cache = {} if self.system.use_rolling_horizon else None
+        # solution of the previous solve to warm start the next solve
+        self.warm_start_solution = None
+        self.warm_start_info = {}
 
         # initiate dictionary for storing extra year data
         self.year_specific_ts = {}
@@ -103,7 +125,8 @@ class OptimizationSetup(object):
         self.energy_system = EnergySystem(optimization_setup=self)
 
         # add Elements to optimization
-        self.add_elements()
+        with self.tracer.span("add_elements"):
+            self.add_elements()
 
         # check if all elements from the scenario_dict are in the model
         ScenarioDict.check_if_all_elements_in_model(
@@ -117,17 +140,20 @@ class OptimizationSetup(object):
         self.set_base_configuration()
 
         # read input data into elements
-        self.read_input_csv()
+        with self.tracer.span("read_input_data"):
+            self.read_input_csv()
 
         # conduct consistency checks of input units
-        self.energy_system.unit_handling.consistency_checks_input_units(
-            optimization_setup=self
-        )
+        with self.tracer.span("unit_consistency_checks"):
+            self.energy_system.unit_handling.consistency_checks_input_units(
+                optimization_setup=self
+            )
 
         # conduct time series aggregation
-        self.time_series_aggregation = TimeSeriesAggregation(
-            energy_system=self.energy_system
-        )
+        with self.tracer.span("time_series_aggregation"):
+            self.time_series_aggregation = TimeSeriesAggregation(
+                energy_system=self.energy_system
+            )
 
     def create_paths(self):
         """This method creates a dictionary with the paths of the data split
@@ -140,9 +166,11 @@ class OptimizationSetup(object):
             self.path_data
         ), f"Folder for input data {self.analysis.dataset} does not exist!"
         self.input_data_checks.check_primary_folder_structure()
+        # index of the folders and files of the dataset
+        self.dataset_index = DatasetIndex.get(self.path_data)
         self.paths = dict()
         # create a dictionary with the keys based on the folders in path_data
-        for folder_name in next(os.walk(self.path_data))[1]:
+        for folder_name in self.dataset_index.list_folders(self.path_data):
             self.paths[folder_name] = dict()
             self.paths[folder_name]["folder"] = os.path.join(
                 self.path_data, folder_name
@@ -173,12 +201,12 @@ class OptimizationSetup(object):
         """
         if subsets is None:
             subsets = []
-        for element in next(os.walk(path))[1]:
+        for element in self.dataset_index.list_folders(path):
             if element not in subsets:
                 self.paths[set_name][element] = dict()
                 self.paths[set_name][element]["folder"] = os.path.join(path, element)
                 sub_path = os.path.join(path, element)
-                for file in next(os.walk(sub_path))[2]:
+                for file in self.dataset_index.list_files(sub_path):
                     self.paths[set_name][element][file] = os.path.join(sub_path, file)
                 # add element paths to parent sets
                 parent_sets = self._find_parent_set(self.analysis.subsets, set_name)
@@ -266,14 +294,43 @@ class OptimizationSetup(object):
         """Read the input and conducts the time series aggregation."""
         logging.info("\n--- Read input data of elements --- \n")
         self.energy_system.store_input_data()
-        for element in self.dict_elements["Element"]:
-            element_class = [
-                k
-                for k, v in self.dict_element_classes.items()
-                if v == element.__class__
-            ][0]
-            logging.info(f"Create {element_class} {element.name}")
-            element.store_input_data()
+        # reuse the input data of the elements that are unchanged between scenarios
+        self.element_data_cache = (
+            ElementDataCache(self) if self.solver.reuse_element_input_data else None
+        )
+        elements = self.dict_elements["Element"]
+        n_workers = min(self.solver.n_input_workers, len(elements))
+        if n_workers > 1:
+            # the elements are independent and mostly wait for file reads
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                futures = [
+                    executor.submit(self.store_input_data_of_element, element)
+                    for element in elements
+                ]
+                # raise the first error in the order of the elements
+                for future in futures:
+                    future.result()
+        else:
+            for element in elements:
+                self.store_input_data_of_element(element)
+
+    def store_input_data_of_element(self, element):
+        """Reads the input data of an element.
+
+        :param element: element whose input data is read
+        """
+        element_class = [
+            k for k, v in self.dict_element_classes.items() if v == element.__class__
+        ][0]
+        if self.element_data_cache is not None and self.element_data_cache.load(
+            element
+        ):
+            logging.info(f"Reuse the input data of {element_class} {element.name}")
+            return
+        logging.info(f"Create {element_class} {element.name}")
+        element.store_input_data()
+        if self.element_data_cache is not None:
+            self.element_data_cache.save(element)
 
     def add_element(self, element_class, name):
         """Add an element to the element_dict with the class labels as key.
@@ -668,6 +725,11 @@ class OptimizationSetup(object):
             if self.solver.solver_options[key] is not None
         }
 
+        # write start values from the previous solution
+        warmstart_fn = None
+        if self.solver.warm_start:
+            warmstart_fn = self.write_warm_start_file()
+
         logging.info(f"\n--- Solve model instance using {solver_name} ---\n")
         # disable logger temporarily
         logging.disable(logging.WARNING)
@@ -678,6 +740,7 @@ class OptimizationSetup(object):
                 io_api=self.solver.io_api,
                 keep_files=self.solver.keep_files,
                 sanitize_zeros=True,
+                warmstart_fn=warmstart_fn,
                 # remaining kwargs are passed to the solver
                 **solver_options,
             )
@@ -687,9 +750,12 @@ class OptimizationSetup(object):
                 io_api=self.solver.io_api,
                 keep_files=self.solver.keep_files,
                 sanitize_zeros=True,
+                warmstart_fn=warmstart_fn,
             )
         # enable logger
         logging.disable(logging.NOTSET)
+        if warmstart_fn is not None and not self.solver.keep_files:
+            os.remove(warmstart_fn)
         if self.model.termination_condition == "optimal":
             self.optimality = True
         elif self.model.termination_condition == "suboptimal":
@@ -698,6 +764,102 @@ class OptimizationSetup(object):
         else:
             self.optimality = False
 
+    def save_warm_start_solution(self):
+        """Stores the (unscaled) solution to warm start the next solve."""
+        if self.solver.warm_start and self.optimality:
+            self.warm_start_solution = self.model.solution.copy(deep=True)
+
+    def write_warm_start_file(self):
+        """Writes the start values of the variables to a file read by the solver.
+
+        The start values are taken from the previous solution, which is mapped onto
+        the current model by variable name and coordinates. Variables without a
+        previous value start at the bound closest to zero. HiGHS reads the start
+        values as a solution file, Gurobi as a MIP start.
+
+        :return: path of the warm start file, None if no start values are available
+        """
+        self.warm_start_info = {}
+        if self.warm_start_solution is None:
+            return None
+        if self.solver.name == "highs":
+            suffix = ".sol"
+        elif self.solver.name == "gurobi":
+            suffix = ".mst"
+        else:
+            logging.warning(
+                f"Warm start is not implemented for solver {self.solver.name}"
+            )
+            return None
+        t_start = time.perf_counter()
+        scaling = self.scaling if self.solver.use_scaling else None
+        all_labels = []
+        all_values = []
+        n_mapped = 0
+        n_total = 0
+        for name in self.model.variables:
+            var = self.model.variables[name]
+            labels = var.labels
+            lower = var.lower.broadcast_like(labels)
+            upper = var.upper.broadcast_like(labels)
+            # the bounds are already scaled
+            values = np.clip(0, lower.values, upper.values)
+            has_start = np.zeros(labels.shape, dtype=bool)
+            mask = labels.values != -1
+            if name in self.warm_start_solution and set(
+                self.warm_start_solution[name].dims
+            ) == set(labels.dims):
+                previous = self.warm_start_solution[name].reindex(
+                    {dim: labels.coords[dim].values for dim in labels.dims}
+                )
+                previous = previous.transpose(*labels.dims).values
+                # the previous solution is unscaled
+                if scaling is not None:
+                    previous = np.where(
+                        mask,
+                        previous / scaling.D_c_inv[np.where(mask, labels.values, 0)],
+                        np.nan,
+                    )
+                has_start = ~np.isnan(previous)
+                values = np.where(has_start, previous, values)
+            n_mapped += (has_start & mask).sum()
+            n_total += mask.sum()
+            if suffix == ".mst":
+                mask &= has_start
+            all_labels.append(labels.values[mask])
+            all_values.append(values[mask])
+        all_labels = np.concatenate(all_labels)
+        all_values = np.concatenate(all_values)
+        if n_mapped == 0:
+            logging.info("No start values found in the previous solution")
+            return None
+        # write the start values
+        warmstart_fn = os.path.join(self.solver.solver_dir, f"warm_start{suffix}")
+        lines = [
+            f"x{label} {value:.17g}"
+            for label, value in zip(all_labels, all_values, strict=True)
+        ]
+        with open(warmstart_fn, "w") as file:
+            if suffix == ".sol":
+                file.write(
+                    "Model status\nUnknown\n\n# Primal solution values\nFeasible\n"
+                    f"Objective 0\n# Columns {len(lines)}\n"
+                )
+            else:
+                file.write("# MIP start\n")
+            file.write("\n".join(lines))
+            if suffix == ".sol":
+                file.write("\n# Rows 0\n")
+        self.warm_start_info = {
+            "warm_start_share": n_mapped / n_total,
+            "warm_start_preparation_time": time.perf_counter() - t_start,
+        }
+        logging.info(
+            f"Warm start with {n_mapped} of {n_total} variable values "
+            "from the previous solution"
+        )
+        return warmstart_fn
+
     def write_IIS(self, scenario=""):
         """Write an ILP file to print the IIS if infeasible and using Gurobi."""
         if (
@@ -906,3 +1068,12 @@ class OptimizationSetup(object):
                     f"the custom set {custom_set} cannot be used as a subindex of"
                     f"{component_data.index}"
                 ) from err
+
+
+# import all modules of the model and set the element classes of the EnergySystem
+for _, module, _ in pkgutil.walk_packages(model.__path__, prefix=f"{model.__name__}."):
+    importlib.import_module(module)
+inheritors = get_inheritors(Element)
+OptimizationSetup.dict_element_classes.update(
+    {klass.__name__: klass for klass in inheritors}
+)
@@ -7,6 +7,8 @@ save them in a result dictionary (resultDict).
 import json
 import logging
 import os
+import queue
+import threading
 import warnings
 from pathlib import Path
 
@@ -20,6 +22,7 @@ from pydantic import BaseModel
 from tables import NaturalNameWarning
 
 from ..optimization_setup import OptimizationSetup
+from ..utils import ExpandedScenarios
 
 # Warnings
 warnings.filterwarnings("ignore", category=NaturalNameWarning)
@@ -36,6 +39,7 @@ class Postprocess:
         subfolder=None,
         scenario_name=None,
         param_map=None,
+        writer=None,
     ):
         """Postprocessing of the results of the optimization.
 
@@ -44,6 +48,8 @@ class Postprocess:
         :param subfolder: The subfolder used for the results
         :param scenario_name: The name of the current scenario
         :param param_map: A dictionary mapping the parameters to the scenario names
+        :param writer: PostprocessWriter to write the files in the background. If
+            None, the files are written directly
         """
         logging.info("--- Postprocess results ---")
         # get the necessary stuff from the model
@@ -60,6 +66,7 @@ class Postprocess:
         self.constraints = optimization_setup.constraints
         self.param_map = param_map
         self.scaling = optimization_setup.scaling
+        self.writer = writer
 
         # get name or directory
         self.model_name = model_name
@@ -136,6 +143,20 @@ class Postprocess:
                 "in h5 files."
             )
 
+        if self.writer is not None:
+            self.writer.submit(self._write_file, name, dictionary, format, mode)
+        else:
+            self._write_file(name, dictionary, format, mode)
+
+    def _write_file(self, name, dictionary, format, mode):
+        """Writes the dictionary to file in the given format.
+
+        Args:
+            name: Filename without extension
+            dictionary: The dictionary to save
+            format: The format of the file
+            mode: Writing mode for python file, 'w' or 'a'
+        """
         if format == "yml":
             # serialize to string
             serialized_dict = yaml.dump(dictionary)
@@ -151,10 +172,6 @@ class Postprocess:
                         outfile.write(serialized_dict)
 
         elif format == "json":
-            # serialize to string
-
-            serialized_dict = json.dumps(dictionary, indent=2)
-
             # write normal json
             f_name = f"{name}.json"
             f_mode = "w+"
@@ -163,7 +180,11 @@ class Postprocess:
             if self.overwrite or not os.path.exists(f_name):
                 with FileLock(f_name + ".lock").acquire(timeout=300):
                     with open(f_name, f_mode) as outfile:
-                        outfile.write(serialized_dict)
+                        # the expanded scenarios are written one at a time
+                        if isinstance(dictionary, ExpandedScenarios):
+                            dictionary.write_json(outfile, indent=2)
+                        else:
+                            outfile.write(json.dumps(dictionary, indent=2))
 
         elif format == "h5":
             f_name = f"{name}.h5"
@@ -224,6 +245,7 @@ class Postprocess:
             )
 
         benchmarking_data["scaling_time"] = self.scaling.scaling_time
+        benchmarking_data.update(self.optimization_setup.warm_start_info)
         # get numerical range
         range_lhs, range_rhs = self.scaling.print_numerics(
             0, no_scaling=False, benchmarking_output=True
@@ -769,3 +791,58 @@ class Postprocess:
                 f"Expected keys are {expected_keys}, but got " f"{input_dict.keys()}"
             )
         return input_dict, units, docstring, has_units
+
+
+class PostprocessWriter:
+    """Writes the output files of the postprocessing in a background thread.
+
+    The results are converted to data frames in the main thread, so that the
+    optimization can continue with the next step while the files are written. The
+    bounded queue limits the number of files waiting to be written and thus the
+    memory footprint.
+    """
+
+    def __init__(self, max_queue_size=16):
+        """Starts the writer thread.
+
+        :param max_queue_size: maximum number of files waiting to be written
+        """
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.error = None
+        self.thread = threading.Thread(
+            target=self._write_files, name="PostprocessWriter", daemon=True
+        )
+        self.thread.start()
+
+    def submit(self, func, *args):
+        """Adds a file to the queue, blocks if the queue is full.
+
+        :param func: function writing the file
+        :param args: arguments of the function
+        """
+        if self.error is not None:
+            raise RuntimeError("Writing the results failed") from self.error
+        self.queue.put((func, args))
+
+    def join(self, raise_error=True):
+        """Waits until all files are written and stops the writer thread.
+
+        :param raise_error: if False, an error of the writer is only logged
+        :raises RuntimeError: if writing a file failed and raise_error is True
+        """
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None and raise_error:
+            raise RuntimeError("Writing the results failed") from self.error
+
+    def _write_files(self):
+        """Writes the files in the queue until the writer is joined."""
+        while (item := self.queue.get()) is not None:
+            func, args = item
+            # skip the remaining files after an error
+            if self.error is None:
+                try:
+                    func(*args)
+                except Exception as e:
+                    logging.error(f"Writing the results failed: {e}")
+                    self.error = e
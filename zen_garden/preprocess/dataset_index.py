@@ -0,0 +1,129 @@
+"""Index of the folders and files of a dataset.
+
+Reading the input data looks up many files in the same element folders. The index
+lists each folder once and serves all later lookups from memory. A folder is listed
+again only if its modification time changes, i.e., if files were added, removed or
+renamed in it.
+"""
+
+import os
+
+
+class DatasetIndex:
+    """Index of the folders and files of a dataset."""
+
+    # indices of the datasets, shared by all scenarios in the same process
+    _indices = {}
+
+    def __init__(self, dataset):
+        """Initializes an empty index of the dataset.
+
+        :param dataset: path to the dataset
+        """
+        self.dataset = os.path.normpath(os.path.abspath(dataset))
+        # folder path -> (modification time, sub folders, files, set of files)
+        self._folders = {}
+        # (folder path, file name) -> (modification time, year-specific files)
+        self._year_specific_files = {}
+
+    @classmethod
+    def get(cls, dataset):
+        """Returns the index of the dataset, which is created on first use.
+
+        :param dataset: path to the dataset
+        :return: DatasetIndex of the dataset
+        """
+        key = os.path.normpath(os.path.abspath(dataset))
+        if key not in cls._indices:
+            cls._indices[key] = cls(key)
+        return cls._indices[key]
+
+    def _get_entry(self, folder):
+        """Returns the listing of a folder and lists it if it has changed.
+
+        :param folder: path to the folder
+        :return: tuple of modification time, sub folders, files and set of files
+        """
+        folder = os.path.normpath(os.fspath(folder))
+        mtime = os.stat(folder).st_mtime_ns
+        entry = self._folders.get(folder)
+        if entry is None or entry[0] != mtime:
+            folders = []
+            files = []
+            with os.scandir(folder) as it:
+                for dir_entry in it:
+                    if dir_entry.is_dir():
+                        folders.append(dir_entry.name)
+                    else:
+                        files.append(dir_entry.name)
+            entry = (mtime, folders, files, frozenset(files))
+            self._folders[folder] = entry
+        return entry
+
+    def exists(self, path):
+        """Checks if a folder or a file exists.
+
+        :param path: path to the folder or file
+        :return: True if the folder or file exists
+        """
+        folder, name = os.path.split(os.path.normpath(os.fspath(path)))
+        if not os.path.isdir(folder):
+            return False
+        _, folders, _, files = self._get_entry(folder)
+        return name in files or name in folders
+
+    def list_folders(self, folder):
+        """Returns the names of the sub folders of a folder.
+
+        :param folder: path to the folder
+        :return: list of folder names
+        """
+        return list(self._get_entry(folder)[1])
+
+    def list_files(self, folder):
+        """Returns the names of the files in a folder.
+
+        :param folder: path to the folder
+        :return: list of file names
+        """
+        return list(self._get_entry(folder)[2])
+
+    def has_file(self, folder, file_name):
+        """Checks if a folder contains a file.
+
+        :param folder: path to the folder
+        :param file_name: name of the file including the extension
+        :return: True if the file exists in the folder
+        """
+        return file_name in self._get_entry(folder)[3]
+
+    def get_year_specific_files(self, folder, file_name, years):
+        """Returns the years for which a folder contains a year-specific file.
+
+        A file is year-specific for a year if its name contains
+        ``<file_name>_<year>``.
+
+        :param folder: path to the folder
+        :param file_name: name of the generic file without the extension
+        :param years: list of years as strings
+        :return: dict of the index of the year in years and the year-specific name
+        """
+        mtime, _, files, _ = self._get_entry(folder)
+        key = (os.path.normpath(os.fspath(folder)), file_name)
+        cached = self._year_specific_files.get(key)
+        if cached is None or cached[0] != mtime:
+            # all years that follow the file name in any of the files
+            prefix = f"{file_name}_"
+            found = set()
+            for file in files:
+                start = file.find(prefix)
+                while start != -1:
+                    found.add(file[start + len(prefix) :])
+                    start = file.find(prefix, start + 1)
+            cached = (mtime, found)
+            self._year_specific_files[key] = cached
+        return {
+            i: f"{file_name}_{year}"
+            for i, year in enumerate(years)
+            if any(suffix.startswith(year) for suffix in cached[1])
+        }
@@ -0,0 +1,177 @@
+"""Reuse of the input data of elements between scenarios.
+
+A scenario usually overwrites the input data of a few elements. The input data of
+all other elements is the same as in the previous scenarios. The cache keeps a copy
+of the input data of each element after it is read. An element of a later scenario
+reuses the copy if nothing it depends on changed, i.e., the configuration after
+applying the scenario, the entries of the energy system and of the element in the
+scenario dict, and the files of the energy system and of the element.
+"""
+
+import copy
+import hashlib
+import json
+import os
+
+from zen_garden.preprocess.model_cache import EXCLUDED_CONFIG_KEYS
+
+# attributes of an element that refer to the optimization setup of the scenario
+SCENARIO_ATTRIBUTES = ["optimization_setup", "energy_system", "data_input"]
+# solver settings that change the input data, the others only change the solve
+INPUT_SOLVER_KEYS = [
+    "check_unit_consistency",
+    "linear_regression_check",
+    "round_parameters",
+    "rounding_decimal_points_units",
+    "rounding_decimal_points_capacity",
+    "rounding_decimal_points_tsa",
+]
+
+
+class ElementDataCache:
+    """Cache of the input data of the elements, shared by the scenarios of a run."""
+
+    # copies of the input data of the elements, shared by all scenarios in the process
+    _snapshots = {}
+
+    def __init__(self, optimization_setup):
+        """Initializes the cache for the scenario of an optimization setup.
+
+        :param optimization_setup: OptimizationSetup of the scenario
+        """
+        self.optimization_setup = optimization_setup
+        self.setup_key = self.get_setup_key()
+
+    def get_setup_key(self):
+        """Computes the fingerprint of what all elements depend on.
+
+        :return: hex digest of the fingerprint
+        """
+        optimization_setup = self.optimization_setup
+        hasher = hashlib.sha256()
+        config_dict = {
+            "analysis": optimization_setup.analysis.model_dump(
+                exclude=set(EXCLUDED_CONFIG_KEYS["analysis"])
+            ),
+            "system": optimization_setup.system.model_dump(),
+            "solver": optimization_setup.solver.model_dump(
+                include=set(INPUT_SOLVER_KEYS)
+            ),
+        }
+        hasher.update(json.dumps(config_dict, sort_keys=True, default=str).encode())
+        hasher.update(
+            json.dumps(
+                optimization_setup.scenario_dict.dict.get("EnergySystem"),
+                sort_keys=True,
+                default=str,
+            ).encode()
+        )
+        energy_system_folder = os.path.join(
+            optimization_setup.analysis.dataset, "energy_system"
+        )
+        hasher.update(self._get_folder_state(energy_system_folder).encode())
+        return hasher.hexdigest()
+
+    def get_element_key(self, element):
+        """Computes the fingerprint of what the input data of an element depends on.
+
+        :param element: element of the optimization
+        :return: key of the element in the cache
+        """
+        hasher = hashlib.sha256(self.setup_key.encode())
+        hasher.update(
+            json.dumps(
+                self.optimization_setup.scenario_dict.dict.get(element.name),
+                sort_keys=True,
+                default=str,
+            ).encode()
+        )
+        hasher.update(self._get_folder_state(element.input_path).encode())
+        return type(element).__name__, element.name, hasher.hexdigest()
+
+    def load(self, element):
+        """Restores the input data of an element if it is in the cache.
+
+        :param element: element whose input data is restored
+        :return: True if the input data is restored
+        """
+        snapshot = self._snapshots.get(self.get_element_key(element))
+        if snapshot is None:
+            return False
+        attributes, year_specific_ts = copy.deepcopy(
+            snapshot, memo=self._get_memo(element, restore=True)
+        )
+        element.__dict__.update(attributes)
+        for year, ts in year_specific_ts.items():
+            self.optimization_setup.year_specific_ts.setdefault(year, {}).update(ts)
+        element.store_scenario_dict()
+        return True
+
+    def save(self, element):
+        """Saves a copy of the input data of an element.
+
+        :param element: element whose input data is saved
+        """
+        attributes = {
+            name: value
+            for name, value in element.__dict__.items()
+            if name not in SCENARIO_ATTRIBUTES
+        }
+        year_specific_ts = {}
+        # the elements can be read in parallel threads, so the dicts are copied
+        for year, ts in list(self.optimization_setup.year_specific_ts.items()):
+            element_ts = {
+                key: df for key, df in list(ts.items()) if key[0] == element._name
+            }
+            if element_ts:
+                year_specific_ts[year] = element_ts
+        self._snapshots[self.get_element_key(element)] = copy.deepcopy(
+            (attributes, year_specific_ts), memo=self._get_memo(element)
+        )
+
+    def _get_memo(self, element, restore=False):
+        """Returns the memo of the deep copies, which replaces the objects of the
+        scenario by placeholders when saving and the placeholders by the objects of
+        the current scenario when restoring.
+
+        :param element: element whose input data is copied
+        :param restore: True if the input data is restored
+        :return: memo dict of copy.deepcopy
+        """
+        memo = {}
+        for name in SCENARIO_ATTRIBUTES:
+            placeholder = _PLACEHOLDERS[name]
+            if restore:
+                memo[id(placeholder)] = getattr(element, name)
+            else:
+                memo[id(getattr(element, name))] = placeholder
+        return memo
+
+    @staticmethod
+    def _get_folder_state(folder):
+        """Returns the names, sizes and modification times of the files of a folder.
+
+        :param folder: path to the folder
+        :return: string of the state of the files
+        """
+        with os.scandir(folder) as it:
+            state = sorted(
+                (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                for entry in it
+                if entry.is_file()
+            )
+        return str(state)
+
+
+class _Placeholder:
+    """Placeholder of an object of the scenario in the cached input data."""
+
+    def __init__(self, name):
+        """Initializes the placeholder.
+
+        :param name: name of the replaced attribute
+        """
+        self.name = name
+
+
+_PLACEHOLDERS = {name: _Placeholder(name) for name in SCENARIO_ATTRIBUTES}
@@ -8,7 +8,9 @@ import warnings
 
 import numpy as np
 import pandas as pd
-from scipy.stats import linregress
+
+from zen_garden.preprocess.dataset_index import DatasetIndex
+from zen_garden.preprocess.input_cache import InputCache
 
 
 class DataInput:
@@ -42,6 +44,12 @@ class DataInput:
         self.unit_handling = unit_handling
         # extract folder path
         self.folder_path = self.element.input_path
+        # index of the files of the dataset
+        self.dataset_index = DatasetIndex.get(self.analysis.dataset)
+        # cache of the parsed csv files
+        self.input_cache = (
+            InputCache(self.solver.solver_dir) if self.solver.use_input_cache else None
+        )
         # get names of indices
         self.index_names = self.analysis.header_data_inputs
         # load attributes file
@@ -264,31 +272,50 @@ class DataInput:
     def read_input_csv(self, input_file_name):
         """Reads input data and returns raw input dataframe.
 
+        The data is read from a .csv file or, if it does not exist, from a
+        .parquet or .feather file (requires pyarrow).
+
         :param input_file_name: name of selected file
         :return: df_input: pd.DataFrame with input data
         """
-        # append .csv suffix
-        input_file_name += ".csv"
-
         # select data
-        file_names = os.listdir(self.folder_path)
-        if input_file_name in file_names:
-            df_input = pd.read_csv(
-                os.path.join(self.folder_path, input_file_name),
-                header=0,
-                index_col=None,
+        if self.dataset_index.has_file(self.folder_path, f"{input_file_name}.csv"):
+            path = os.path.join(self.folder_path, f"{input_file_name}.csv")
+            if self.input_cache is not None:
+                return self.input_cache.read_csv(path, self._read_csv)
+            return self._read_csv(path)
+        elif self.dataset_index.has_file(
+            self.folder_path, f"{input_file_name}.parquet"
+        ):
+            return pd.read_parquet(
+                os.path.join(self.folder_path, f"{input_file_name}.parquet")
+            )
+        elif self.dataset_index.has_file(
+            self.folder_path, f"{input_file_name}.feather"
+        ):
+            return pd.read_feather(
+                os.path.join(self.folder_path, f"{input_file_name}.feather")
             )
-            # check for header name duplicates (pd.read_csv() adds a dot and a
-            # number to duplicate headers)
-            if any("." in col for col in df_input.columns):
-                raise AssertionError(
-                    f"The input data file {input_file_name} at "
-                    f"{self.folder_path} contains two identical header names."
-                )
-            return df_input
         else:
             return None
 
+    @staticmethod
+    def _read_csv(path):
+        """Reads a csv input file.
+
+        :param path: path to the csv file
+        :return: df_input: pd.DataFrame with input data
+        """
+        df_input = pd.read_csv(path, header=0, index_col=None)
+        # check for header name duplicates (pd.read_csv() adds a dot and a
+        # number to duplicate headers)
+        if any("." in col for col in df_input.columns):
+            raise AssertionError(
+                f"The input data file {os.path.basename(path)} at "
+                f"{os.path.dirname(path)} contains two identical header names."
+            )
+        return df_input
+
     def read_input_json(self, input_file_name):
         """Reads json input data and returns a dict.
 
@@ -297,8 +324,7 @@ class DataInput:
         """
         input_file_name += ".json"
 
-        file_names = os.listdir(self.folder_path)
-        if input_file_name in file_names:
+        if self.dataset_index.has_file(self.folder_path, input_file_name):
             with open(os.path.join(self.folder_path, input_file_name), "r") as file:
                 data = json.load(file)
             return data
@@ -310,10 +336,10 @@ class DataInput:
         :param filename: name of attributes file, default is 'attributes'
         :return: attribute_dict.
         """
-        if os.path.exists(self.folder_path / f"{filename}.json"):
+        if self.dataset_index.has_file(self.folder_path, f"{filename}.json"):
             attribute_dict = self._load_attribute_file_json(filename=filename)
         # extract csv
-        elif os.path.exists(self.folder_path / f"{filename}.csv"):
+        elif self.dataset_index.has_file(self.folder_path, f"{filename}.csv"):
             raise NotImplementedError(
                 f"The .csv format for attributes is deprecated "
                 f"({filename} of {self.element.name}). Use .json instead."
@@ -558,41 +584,33 @@ class DataInput:
                 self.system.interval_between_years,
             )
         ]
-        # files to check
-        file_names = os.listdir(self.folder_path)
-        for file in file_names:
-            for i, year in enumerate(years):
-                filename = file_name + "_" + year
-                if filename in file:
-                    # read input data
-                    f_name, scenario_factor = self.scenario_dict.get_param_file(
-                        self.element.name, filename
-                    )
-                    df_input = self.read_input_csv(f_name)
-                    if df_input is not None and not df_input.empty:
-                        # get subelement dataframe
-                        if subelement is not None and subelement in df_input.columns:
-                            cols = df_input.columns.intersection(
-                                index_name_list + [subelement]
-                            )
-                            df_input = df_input[cols]
-                        df_output_specific = self.extract_general_input_data(
-                            df_input,
-                            df_output_generic,
-                            file_name,
-                            index_name_list,
-                            default_value,
-                            time_steps,
-                        )
-                    try:
-                        self.optimization_setup.year_specific_ts[i][
-                            (self.element._name, file_name)
-                        ] = (df_output_specific * scenario_factor)
-                    except Exception:
-                        self.optimization_setup.year_specific_ts[i] = {}
-                        self.optimization_setup.year_specific_ts[i][
-                            (self.element._name, file_name)
-                        ] = (df_output_specific * scenario_factor)
+        # year-specific files
+        year_specific_files = self.dataset_index.get_year_specific_files(
+            self.folder_path, file_name, years
+        )
+        for i, filename in year_specific_files.items():
+            # read input data
+            f_name, scenario_factor = self.scenario_dict.get_param_file(
+                self.element.name, filename
+            )
+            df_input = self.read_input_csv(f_name)
+            if df_input is not None and not df_input.empty:
+                # get subelement dataframe
+                if subelement is not None and subelement in df_input.columns:
+                    cols = df_input.columns.intersection(index_name_list + [subelement])
+                    df_input = df_input[cols]
+                df_output_specific = self.extract_general_input_data(
+                    df_input,
+                    df_output_generic,
+                    file_name,
+                    index_name_list,
+                    default_value,
+                    time_steps,
+                )
+            # setdefault is atomic, so elements can be read in parallel
+            self.optimization_setup.year_specific_ts.setdefault(i, {})[
+                (self.element._name, file_name)
+            ] = (df_output_specific * scenario_factor)
 
     def extract_yearly_variation(self, file_name, index_sets):
         """Reads the yearly variation of a time dependent quantity.
@@ -800,8 +818,8 @@ class DataInput:
         f_name, scenario_factor = self.scenario_dict.get_param_file(
             self.element.name, file_name
         )
-        if f"{f_name}.csv" in os.listdir(self.folder_path):
-            df_input = self.read_input_csv(f_name)
+        df_input = self.read_input_csv(f_name)
+        if df_input is not None:
             # fill output dataframe
             df_output = self.extract_general_input_data(
                 df_input,
@@ -870,6 +888,8 @@ class DataInput:
                     )
                 else:
                     # conduct linear regress
+                    from scipy.stats import linregress
+
                     linear_regress_object = linregress(
                         nonlinear_values[breakpoint_variable],
                         nonlinear_values[value_variable],
@@ -1183,33 +1203,25 @@ class DataInput:
                 index_name_list
             ).to_list()
             df_input = df_input.set_index(index_names_column)
+            # pad the data to all years and the product of the other indices
             if df_input.index.nlevels == 1:
                 combined_index = df_input.index.union(
                     self.energy_system.set_time_steps_years
                 )
-                is_single_index = True
             else:
                 index_list = []
                 for index_name in index_names_column:
+                    level_values = df_input.index.get_level_values(index_name).unique()
                     if index_name == temporal_header:
-                        index_list.append(
-                            df_input.index.get_level_values(index_name)
-                            .unique()
-                            .union(self.energy_system.set_time_steps_years)
-                        )
-                    else:
-                        index_list.append(
-                            df_input.index.get_level_values(index_name).unique()
+                        level_values = level_values.union(
+                            self.energy_system.set_time_steps_years
                         )
+                    index_list.append(level_values.sort_values())
+                # the product of the sorted levels is sorted
                 combined_index = pd.MultiIndex.from_product(
                     index_list, names=index_names_column
-                ).sort_values()
-                is_single_index = False
-            df_input_temp = pd.DataFrame(index=combined_index, columns=df_input.columns)
-            common_index = df_input.index.intersection(combined_index)
-            df_input_temp.loc[common_index] = df_input.loc[common_index]
-            # df_input_temp.loc[df_input.index] = df_input
-            df_input = df_input_temp.astype(float)
+                )
+            df_input = df_input.reindex(combined_index).astype(float)
             # interpolate missing data
             file_names_int_off = []
             if self.energy_system.parameters_interpolation_off is not None:
@@ -1217,24 +1229,7 @@ class DataInput:
                     "parameter_name"
                 ]
             if file_name not in file_names_int_off:
-                parameters = df_input.axes[1]
-                for param in parameters:
-                    if param not in index_names_column and df_input[param].isna().any():
-                        if is_single_index:
-                            df_input[param] = (
-                                df_input[param]
-                                .astype(float)
-                                .interpolate(method="index")
-                            )
-                        else:
-                            df_input_temp = df_input[param].unstack(
-                                df_input.index.names.difference([temporal_header])
-                            )
-                            df_input[param] = (
-                                df_input_temp.interpolate(method="index", axis=0)
-                                .stack()
-                                .reorder_levels(df_input.index.names)
-                            )
+                df_input = self._interpolate_yearly(df_input, temporal_header)
             else:
                 logging.info(
                     f"Parameter {file_name} data won't be interpolated to "
@@ -1254,11 +1249,65 @@ class DataInput:
                     strict=False,
                 )
             }
-            df_input[temporal_header] = df_input[temporal_header].apply(
-                lambda year: year2step[year]
-            )
+            df_input[temporal_header] = df_input[temporal_header].map(year2step)
         return df_input
 
+    @staticmethod
+    def _interpolate_yearly(df_input, temporal_header):
+        """Linearly interpolates the missing values between the years.
+
+        The values are interpolated for each combination of the other indices
+        like pd.Series.interpolate(method="index"), i.e., missing values before
+        the first given year stay missing and missing values after the last given
+        year take the value of the last given year. The index of df_input is the
+        sorted product of its levels.
+
+        :param df_input: input dataframe with all years in the index
+        :param temporal_header: name of the year index
+        :return: df_input: input dataframe with interpolated values
+        """
+        values = df_input.to_numpy(dtype=float)
+        if not np.isnan(values).any():
+            return df_input
+        if df_input.index.nlevels == 1:
+            shape = (len(df_input.index),)
+            position = 0
+        else:
+            shape = tuple(len(level) for level in df_input.index.levels)
+            position = df_input.index.names.index(temporal_header)
+        years = df_input.index.unique(temporal_header).to_numpy(dtype=float)
+        # one row per combination of the other indices and column
+        rows = np.moveaxis(values.reshape(shape + (-1,)), position, -1)
+        rows_shape = rows.shape
+        rows = rows.reshape(-1, len(years))
+        # previous and next given year of each year
+        n_years = len(years)
+        positions = np.arange(n_years)
+        is_given = ~np.isnan(rows)
+        previous = np.maximum.accumulate(np.where(is_given, positions, -1), axis=1)
+        following = np.minimum.accumulate(
+            np.where(is_given, positions, n_years)[:, ::-1], axis=1
+        )[:, ::-1]
+        has_previous = previous >= 0
+        has_following = following < n_years
+        previous = np.clip(previous, 0, n_years - 1)
+        following = np.clip(following, 0, n_years - 1)
+        row_index = np.arange(rows.shape[0])[:, None]
+        y_previous = rows[row_index, previous]
+        y_following = rows[row_index, following]
+        x_previous = years[previous]
+        x_following = years[following]
+        # same arithmetic as np.interp, which pandas uses
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slope = (y_following - y_previous) / (x_following - x_previous)
+            interpolated = slope * (years - x_previous) + y_previous
+        interpolated = np.where(has_following, interpolated, y_previous)
+        rows = np.where(is_given, rows, np.where(has_previous, interpolated, np.nan))
+        values = np.moveaxis(rows.reshape(rows_shape), -1, position).reshape(
+            values.shape
+        )
+        return pd.DataFrame(values, index=df_input.index, columns=df_input.columns)
+
     @staticmethod
     def extract_from_input_without_missing_index(df_input, index_name_list, file_name):
         """Extracts the demanded values from Input dataframe and
@@ -0,0 +1,96 @@
+"""Cache of parsed csv input files.
+
+Parsing large csv files (e.g., hourly profiles of many nodes) is the largest cost of
+reading the input data and repeats for every scenario and every run. The cache
+stores the parsed dataframe of each csv file in the solver directory and reuses it
+as long as the csv file is unchanged. A file is unchanged if its modification time
+and size are unchanged or, if they changed, if its content hash is unchanged.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from pathlib import Path
+
+
+class InputCache:
+    """Cache of parsed csv input files in the solver directory."""
+
+    def __init__(self, solver_dir):
+        """Initializes the input cache.
+
+        :param solver_dir: solver directory in which the cache folder is created
+        """
+        self.folder = Path(solver_dir).joinpath("input_cache")
+
+    def read_csv(self, path, reader):
+        """Returns the parsed csv file from the cache or parses and caches it.
+
+        :param path: path to the csv file
+        :param reader: function that parses the csv file to a dataframe
+        :return: parsed dataframe
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        cache_file = self.folder.joinpath(
+            f"{hashlib.sha256(path.encode()).hexdigest()}.pkl"
+        )
+        file_hash = None
+        if cache_file.exists():
+            try:
+                with open(cache_file, "rb") as f:
+                    meta = pickle.load(f)
+                    if (meta["mtime"], meta["size"]) == (
+                        stat.st_mtime_ns,
+                        stat.st_size,
+                    ):
+                        return pickle.load(f)
+                    file_hash = self._hash_file(path)
+                    if meta["hash"] == file_hash:
+                        df = pickle.load(f)
+                        # the file was touched but not changed
+                        self._save(cache_file, stat, file_hash, df)
+                        return df
+            except Exception as e:
+                logging.warning(f"Could not read the cached input file {path}: {e}")
+        df = reader(path)
+        if file_hash is None:
+            file_hash = self._hash_file(path)
+        self._save(cache_file, stat, file_hash, df)
+        return df
+
+    def _save(self, cache_file, stat, file_hash, df):
+        """Saves the parsed dataframe and the state of the csv file.
+
+        :param cache_file: path to the cache file
+        :param stat: stat result of the csv file
+        :param file_hash: content hash of the csv file
+        :param df: parsed dataframe
+        """
+        meta = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "hash": file_hash}
+        os.makedirs(self.folder, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_file, "wb") as f:
+                pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logging.warning(f"Could not save the input file to the cache: {e}")
+            if tmp_file.exists():
+                os.remove(tmp_file)
+
+    @staticmethod
+    def _hash_file(path):
+        """Computes the content hash of a file.
+
+        :param path: path to the file
+        :return: hex digest of the file content
+        """
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(2**20), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
@@ -0,0 +1,176 @@
+"""Content-addressed cache of constructed optimization problems.
+
+The cache stores the OptimizationSetup after the construction of the optimization
+problem. It is keyed by a fingerprint of the dataset files, the configuration and
+the scenario dict, so that a rerun with unchanged inputs can skip the
+preprocessing and the model construction and directly scale and solve the model.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+from pathlib import Path
+
+from pint.facets.plain import PlainQuantity, PlainUnit
+
+from zen_garden.preprocess.unit_handling import UnitHandling
+
+# config entries that do not change the constructed optimization problem
+EXCLUDED_CONFIG_KEYS = {
+    "analysis": [
+        "folder_output",
+        "overwrite_output",
+        "output_format",
+        "postprocess_in_background",
+    ],
+    "solver": [
+        "name",
+        "solver_options",
+        "solver_dir",
+        "keep_files",
+        "io_api",
+        "save_duals",
+        "save_parameters",
+        "selected_saved_parameters",
+        "selected_saved_variables",
+        "selected_saved_duals",
+        "analyze_numerics",
+        "run_diagnostics",
+        "warm_start",
+        "use_model_cache",
+        "use_input_cache",
+        "n_input_workers",
+        "use_tsa_cache",
+        "n_tsa_workers",
+        "reuse_element_input_data",
+    ],
+}
+
+
+class ModelCache:
+    """Cache of constructed optimization problems in the solver directory."""
+
+    def __init__(self, config, scenario_dict):
+        """Initializes the model cache for a scenario.
+
+        :param config: config of optimization
+        :param scenario_dict: scenario dict of the scenario
+        """
+        self.folder = Path(config.solver.solver_dir).joinpath("model_cache")
+        self.unit_folder = Path(config.analysis.dataset).joinpath("energy_system")
+        self.key = self.get_key(config, scenario_dict)
+        self.file = self.folder.joinpath(f"{self.key}.pkl")
+
+    @staticmethod
+    def get_key(config, scenario_dict):
+        """Computes the fingerprint of the dataset, the config and the scenario.
+
+        :param config: config of optimization
+        :param scenario_dict: scenario dict of the scenario
+        :return: hex digest of the fingerprint
+        """
+        hasher = hashlib.sha256()
+        # dataset files
+        dataset = config.analysis.dataset
+        for root, dirs, files in os.walk(dataset):
+            dirs.sort()
+            for file in sorted(files):
+                path = os.path.join(root, file)
+                hasher.update(os.path.relpath(path, dataset).encode())
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda f=f: f.read(2**20), b""):
+                        hasher.update(chunk)
+        # config without the entries that do not change the model
+        config_dict = config.model_dump(exclude={"scenarios"})
+        for section, keys in EXCLUDED_CONFIG_KEYS.items():
+            for key in keys:
+                config_dict[section].pop(key, None)
+        hasher.update(json.dumps(config_dict, sort_keys=True, default=str).encode())
+        # scenario
+        hasher.update(json.dumps(scenario_dict, sort_keys=True, default=str).encode())
+        return hasher.hexdigest()
+
+    def load(self, config):
+        """Loads the constructed optimization problem if it is in the cache.
+
+        The analysis and solver config of the current run replace the cached ones.
+
+        :param config: config of optimization
+        :return: OptimizationSetup or None if the model is not cached
+        """
+        if not self.file.exists():
+            return None
+        t_start = time.perf_counter()
+        ureg = UnitHandling.create_unit_registry(self.unit_folder)
+        try:
+            with open(self.file, "rb") as f:
+                optimization_setup = _CacheUnpickler(f, ureg).load()
+        except Exception as e:
+            logging.warning(f"Could not load the cached model {self.file}: {e}")
+            return None
+        optimization_setup.analysis = config.analysis.model_copy(deep=True)
+        optimization_setup.solver = config.solver.model_copy(deep=True)
+        optimization_setup.model.solver_dir = config.solver.solver_dir
+        logging.info(
+            f"Loaded cached model {self.key[:12]} in "
+            f"{time.perf_counter() - t_start:0.1f} seconds"
+        )
+        return optimization_setup
+
+    def save(self, optimization_setup):
+        """Saves the constructed (unscaled) optimization problem to the cache.
+
+        :param optimization_setup: OptimizationSetup after the model construction
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        ureg = optimization_setup.energy_system.unit_handling.ureg
+        tmp_file = self.file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, "wb") as f:
+                _CachePickler(f, ureg, protocol=pickle.HIGHEST_PROTOCOL).dump(
+                    optimization_setup
+                )
+            os.replace(tmp_file, self.file)
+        except Exception as e:
+            logging.warning(f"Could not save the model to the cache: {e}")
+            if tmp_file.exists():
+                os.remove(tmp_file)
+            return
+        logging.info(f"Saved model {self.key[:12]} to the cache")
+
+
+class _CachePickler(pickle.Pickler):
+    """Pickler that stores the unit registry and pint objects by reference."""
+
+    def __init__(self, file, ureg, **kwargs):
+        super().__init__(file, **kwargs)
+        self.ureg = ureg
+
+    def persistent_id(self, obj):
+        if obj is self.ureg:
+            return ("unit_registry",)
+        if isinstance(obj, PlainQuantity):
+            return ("quantity", obj.magnitude, obj._units)
+        if isinstance(obj, PlainUnit):
+            return ("unit", obj._units)
+        return None
+
+
+class _CacheUnpickler(pickle.Unpickler):
+    """Unpickler that attaches the pint objects to a new unit registry."""
+
+    def __init__(self, file, ureg):
+        super().__init__(file)
+        self.ureg = ureg
+
+    def persistent_load(self, pid):
+        if pid[0] == "unit_registry":
+            return self.ureg
+        if pid[0] == "quantity":
+            return self.ureg.Quantity(pid[1], pid[2])
+        if pid[0] == "unit":
+            return self.ureg.Unit(pid[1])
+        raise pickle.UnpicklingError(f"Unknown persistent id {pid[0]}")
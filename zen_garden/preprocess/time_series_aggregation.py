@@ -1,19 +1,33 @@
 """Functions to apply time series aggregation to time series."""
 
 import copy
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import tsam.timeseriesaggregation as tsam
 
 from zen_garden.model.element import Element
 from zen_garden.model.energy_system import EnergySystem
+from zen_garden.preprocess.tsa_clustering import (
+    accuracy_indicators,
+    cluster_time_series,
+)
 
 
 class TimeSeriesAggregation(object):
     """Class containing methods to apply time series aggregation."""
 
+    # results of the aggregation, shared by all scenarios in the process
+    _cached_results = {}
+
     def __init__(self, energy_system: EnergySystem):
         """Initializes the time series aggregation. The data is aggregated
         for a single year and then concatenated.
@@ -23,6 +37,8 @@ class TimeSeriesAggregation(object):
         logging.info("\n--- Time series aggregation ---")
         # initiate dictionary for saving year specific TSA results
         self.year_specific_tsa = {}
+        # accuracy indicators of the aggregations, None for the main aggregation
+        self.accuracy_indicators = {}
         self.energy_system = energy_system
         self.time_steps = self.energy_system.time_steps
         self.optimization_setup = energy_system.optimization_setup
@@ -125,36 +141,26 @@ class TimeSeriesAggregation(object):
             self.typical_periods = self.typical_periods[self.column_names_flat]
             self.typical_periods.columns = self.column_names_original
 
-    def run_tsa(self, year_specific=None):
-        """This method runs the time series aggregation."""
+    def run_tsa(self, year_specific=None, result=None):
+        """This method runs the time series aggregation.
+
+        :param year_specific: year of the year-specific time series
+        :param result: result of the aggregation if it is already computed
+        """
         # substitute column names
         self.substitute_column_names(direction="flatten", year_specific=year_specific)
-        # create aggregation object
-        self.aggregation = tsam.TimeSeriesAggregation(
-            timeSeries=self.df_ts_raw,
-            noTypicalPeriods=self.number_typical_periods,
-            hoursPerPeriod=self.analysis.time_series_aggregation.hoursPerPeriod,
-            resolution=self.analysis.time_series_aggregation.resolution,
-            clusterMethod=self.analysis.time_series_aggregation.clusterMethod,
-            solver=self.analysis.time_series_aggregation.solver,
-            extremePeriodMethod=(
-                self.analysis.time_series_aggregation.extremePeriodMethod
-            ),
-            rescaleClusterPeriods=(
-                self.analysis.time_series_aggregation.rescaleClusterPeriods
-            ),
-            representationMethod=(
-                self.analysis.time_series_aggregation.representationMethod
-            ),
-        )
-        # create typical periods
-        self.typical_periods = self.aggregation.createTypicalPeriods().reset_index(
-            drop=True
-        )
+        if result is None:
+            key = self.get_cache_key()
+            result = self.load_cached_result(key)
+            if result is None:
+                result = self.aggregate()
+                self.save_cached_result(key, result)
+        self.typical_periods = result["typical_periods"]
+        self.report_accuracy(result["accuracy_indicators"], year_specific)
         self.set_time_attributes(
-            self.aggregation.clusterPeriodIdx,
-            self.aggregation.clusterPeriodNoOccur,
-            self.aggregation.clusterOrder,
+            result["cluster_period_idx"],
+            result["cluster_period_no_occur"],
+            result["cluster_order"],
         )
         # resubstitute column names
         self.substitute_column_names(direction="raise")
@@ -163,6 +169,115 @@ class TimeSeriesAggregation(object):
             self.set_aggregated_ts_all_elements()
             self.conducted_tsa = True
 
+    def report_accuracy(self, accuracy, year_specific=None):
+        """Logs the aggregation error and stores the accuracy indicators of each
+        time series.
+
+        :param accuracy: accuracy indicators of each time series
+        :param year_specific: year of the year-specific time series
+        """
+        self.accuracy_indicators[year_specific] = accuracy
+        if accuracy.empty:
+            return
+        worst = accuracy["RMSE"].idxmax()
+        year_info = f" of year {year_specific}" if year_specific is not None else ""
+        logging.info(
+            f"Normalised RMSE of the aggregation{year_info}: mean "
+            f"{accuracy['RMSE'].mean():.3g}, max {accuracy['RMSE'].max():.3g} "
+            f"for {worst}"
+        )
+        logging.debug(f"Accuracy indicators of the aggregation:\n{accuracy}")
+
+    def aggregate(self):
+        """This method clusters the raw time series into typical periods.
+
+        :return: dict with the typical periods, the cluster period indices, the
+            number of occurrences of the cluster periods and the cluster order
+        """
+        return aggregate_time_series(
+            self.df_ts_raw,
+            self.number_typical_periods,
+            self.analysis.time_series_aggregation,
+        )
+
+    def get_cache_key(self, df_ts_raw=None):
+        """Computes the fingerprint of the raw time series and the aggregation
+        settings.
+
+        :param df_ts_raw: raw time series with flat column names, the raw time
+            series of the aggregation if None
+        :return: hex digest of the fingerprint
+        """
+        if df_ts_raw is None:
+            df_ts_raw = self.df_ts_raw
+        hasher = hashlib.sha256()
+        hasher.update(
+            pd.util.hash_pandas_object(df_ts_raw, index=True).to_numpy().tobytes()
+        )
+        settings = [
+            list(df_ts_raw.columns),
+            self.analysis.time_series_aggregation.model_dump(),
+            self.number_typical_periods,
+            version("tsam"),
+        ]
+        hasher.update(json.dumps(settings, default=str).encode())
+        return hasher.hexdigest()
+
+    def load_cached_result(self, key):
+        """Loads the result of an aggregation with the same raw time series and
+        settings, either from memory or from the solver directory.
+
+        :param key: fingerprint of the raw time series and the settings
+        :return: copy of the cached result or None if there is none
+        """
+        result = self._cached_results.get(key)
+        if result is None and self.optimization_setup.solver.use_tsa_cache:
+            file = self._get_cache_file(key)
+            if file.exists():
+                try:
+                    with open(file, "rb") as f:
+                        result = pickle.load(f)
+                except Exception as e:
+                    logging.warning(f"Could not load the cached aggregation: {e}")
+                    return None
+                self._cached_results[key] = result
+        if result is None:
+            return None
+        logging.info(f"Reuse the time series aggregation {key[:12]}")
+        return copy.deepcopy(result)
+
+    def save_cached_result(self, key, result):
+        """Saves the result of an aggregation in memory and, if enabled, in the
+        solver directory.
+
+        :param key: fingerprint of the raw time series and the settings
+        :param result: result of the aggregation
+        """
+        result = copy.deepcopy(result)
+        self._cached_results[key] = result
+        if not self.optimization_setup.solver.use_tsa_cache:
+            return
+        file = self._get_cache_file(key)
+        os.makedirs(file.parent, exist_ok=True)
+        tmp_file = file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, file)
+        except Exception as e:
+            logging.warning(f"Could not save the aggregation to the cache: {e}")
+            if tmp_file.exists():
+                os.remove(tmp_file)
+
+    def _get_cache_file(self, key):
+        """Returns the path of a cached aggregation in the solver directory.
+
+        :param key: fingerprint of the raw time series and the settings
+        :return: path of the cache file
+        """
+        solver_dir = self.optimization_setup.solver.solver_dir
+        return Path(solver_dir).joinpath("tsa_cache", f"{key}.pkl")
+
     def set_aggregated_ts_all_elements(self):
         """This method sets the aggregated time series and sets the necessary
         attributes after the aggregation.
@@ -301,7 +416,10 @@ class TimeSeriesAggregation(object):
         tsa_options = self.analysis.time_series_aggregation
         if tsa_options["representationMethod"] == "meanRepresentation":
             representation_method = "mean"
-        elif tsa_options["representationMethod"] == "mediodRepresentation":
+        elif tsa_options["representationMethod"] in [
+            "medoidRepresentation",
+            "mediodRepresentation",
+        ]:
             representation_method = "median"
         elif tsa_options["representationMethod"] is None:
             if tsa_options["clusterMethod"] == "k_means":
@@ -350,9 +468,11 @@ class TimeSeriesAggregation(object):
             df_ts = raw_ts[ts].unstack(level=header_set_time_steps).T
             # select time series that are not constant (rows have more
             # than 1 unique entries)
-            df_ts_non_constant = df_ts[
-                df_ts.columns[df_ts.apply(lambda column: len(np.unique(column)) != 1)]
-            ]
+            values = df_ts.to_numpy()
+            is_constant = (
+                (values == values[0]) | (pd.isna(values) & pd.isna(values[0]))
+            ).all(axis=0)
+            df_ts_non_constant = df_ts.loc[:, ~is_constant]
             if (element.name, ts) in self.excluded_ts:
                 df_empty = pd.DataFrame(index=df_ts_non_constant.index)
                 dict_raw_ts[ts] = df_empty
@@ -376,58 +496,23 @@ class TimeSeriesAggregation(object):
             new_sequence_time_steps: new sequence of time steps updated with
                 year specific TSA sequence
         """
-        header_set_time_steps = self.analysis.header_data_inputs.set_time_steps
         # only run specific TSA if TSA is activated and set_base_time_steps >
         # aggregated_time_steps
         if (
             self.number_typical_periods < np.size(self.set_base_time_steps)
             and self.system.conduct_time_series_aggregation
         ):
-            for year in self.optimization_setup.year_specific_ts:
-                # create empty dictionary for saving year specific TSA results
-                self.year_specific_tsa[year] = {}
-                # make copy of raw time series
-                year_raw_ts = self.df_ts_raw_copy.copy()
-                elements_time_series = year_raw_ts.columns.droplevel(
-                    list(range(2, year_raw_ts.columns.nlevels))
-                ).unique()
-                for element, ts in elements_time_series:
-                    unstacked = year_raw_ts.unstack(header_set_time_steps)
-                    if (element, ts) in self.optimization_setup.year_specific_ts[
-                        year
-                    ].keys():
-                        index = self.optimization_setup.year_specific_ts[year][
-                            (element, ts)
-                        ].index
-                        if index.size > unstacked[element, ts].size:
-                            index = pd.MultiIndex.from_tuples(
-                                [(element, ts, node, time) for node, time in index],
-                                names=[None, None, "node", "time"],
-                            )
-                            unstacked = unstacked.reindex(unstacked.index.union(index))
-                            unstacked[element, ts].update(
-                                self.optimization_setup.year_specific_ts[year][
-                                    (element, ts)
-                                ]
-                            )
-                        unstacked[element, ts] = (
-                            self.optimization_setup.year_specific_ts[year][
-                                (element, ts)
-                            ]
-                        )
-                    else:
-                        ts_adjusted = self.multiply_yearly_variation(
-                            self.optimization_setup.get_element(Element, element),
-                            ts,
-                            year_raw_ts.unstack(header_set_time_steps)[element, ts],
-                            year,
-                        )
-                        unstacked[element, ts] = ts_adjusted
-                    year_raw_ts = unstacked.unstack(level=header_set_time_steps).T
-                self.df_ts_raw = year_raw_ts
+            years = list(self.optimization_setup.year_specific_ts)
+            raw_ts_of_years = {
+                year: self.get_year_specific_raw_ts(year) for year in years
+            }
+            # the aggregations of the years are independent
+            results = self.aggregate_year_specific_ts(raw_ts_of_years)
+            for year in years:
+                self.df_ts_raw = raw_ts_of_years[year]
                 if not self.df_ts_raw.empty:
                     # run time series aggregation to create typical periods
-                    self.run_tsa(year_specific=year)
+                    self.run_tsa(year_specific=year, result=results.get(year))
                 # nothing to aggregate
                 else:  # ToDo can this be removed?
                     assert len(self.excluded_ts) == 0, (
@@ -447,6 +532,96 @@ class TimeSeriesAggregation(object):
                 self.year_specific_tsa[year] = self.typical_periods
         return new_sequence_time_steps
 
+    def get_year_specific_raw_ts(self, year):
+        """This method combines the raw time series with the year-specific time
+        series of a year.
+
+        :param year: year of the year-specific time series
+        :return: year_raw_ts: raw time series of the year
+        """
+        header_set_time_steps = self.analysis.header_data_inputs.set_time_steps
+        # make copy of raw time series
+        year_raw_ts = self.df_ts_raw_copy.copy()
+        elements_time_series = year_raw_ts.columns.droplevel(
+            list(range(2, year_raw_ts.columns.nlevels))
+        ).unique()
+        for element, ts in elements_time_series:
+            unstacked = year_raw_ts.unstack(header_set_time_steps)
+            if (element, ts) in self.optimization_setup.year_specific_ts[year].keys():
+                index = self.optimization_setup.year_specific_ts[year][
+                    (element, ts)
+                ].index
+                if index.size > unstacked[element, ts].size:
+                    index = pd.MultiIndex.from_tuples(
+                        [(element, ts, node, time) for node, time in index],
+                        names=[None, None, "node", "time"],
+                    )
+                    unstacked = unstacked.reindex(unstacked.index.union(index))
+                    unstacked[element, ts].update(
+                        self.optimization_setup.year_specific_ts[year][(element, ts)]
+                    )
+                unstacked[element, ts] = self.optimization_setup.year_specific_ts[year][
+                    (element, ts)
+                ]
+            else:
+                ts_adjusted = self.multiply_yearly_variation(
+                    self.optimization_setup.get_element(Element, element),
+                    ts,
+                    year_raw_ts.unstack(header_set_time_steps)[element, ts],
+                    year,
+                )
+                unstacked[element, ts] = ts_adjusted
+            year_raw_ts = unstacked.unstack(level=header_set_time_steps).T
+        return year_raw_ts
+
+    def aggregate_year_specific_ts(self, raw_ts_of_years):
+        """This method aggregates the raw time series of the years in a process
+        pool if more than one worker is set.
+
+        :param raw_ts_of_years: dict of the raw time series of each year
+        :return: dict of the aggregation results of the years, empty if the
+            years are aggregated sequentially
+        """
+        n_workers = self.optimization_setup.solver.n_tsa_workers
+        results = {}
+        if n_workers <= 1:
+            return results
+        # years with the same raw time series are only aggregated once
+        pending = {}
+        for year, year_raw_ts in raw_ts_of_years.items():
+            if year_raw_ts.empty:
+                continue
+            df_ts_raw = year_raw_ts.copy()
+            df_ts_raw.columns = [str(index) for index in df_ts_raw.columns]
+            key = self.get_cache_key(df_ts_raw)
+            result = self.load_cached_result(key)
+            if result is not None:
+                results[year] = result
+            else:
+                pending.setdefault(key, (df_ts_raw, []))[1].append(year)
+        if not pending:
+            return results
+        with ProcessPoolExecutor(
+            max_workers=min(n_workers, len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = {
+                key: executor.submit(
+                    aggregate_time_series,
+                    df_ts_raw,
+                    self.number_typical_periods,
+                    self.analysis.time_series_aggregation,
+                )
+                for key, (df_ts_raw, _) in pending.items()
+            }
+            # merge the results in the order of the years
+            for key, future in futures.items():
+                result = future.result()
+                self.save_cached_result(key, result)
+                for year in pending[key][1]:
+                    results[year] = copy.deepcopy(result)
+        return results
+
     def link_time_steps(self):
         """Calculates the necessary overlapping time steps of the investment and
         operation of a technology for all years.
@@ -816,3 +991,116 @@ class TimeSeriesAggregation(object):
         self.set_time_steps = set_time_steps
         self.time_steps_duration = time_steps_duration
         self.sequence_time_steps = sequence_time_steps
+
+
+def aggregate_time_series(df_ts_raw, number_typical_periods, tsa_settings):
+    """Clusters the raw time series into typical periods.
+
+    The function is defined on module level, so that it can run in a process
+    pool.
+
+    :param df_ts_raw: raw time series with flat column names
+    :param number_typical_periods: number of typical periods
+    :param tsa_settings: time series aggregation settings
+    :return: dict with the typical periods, the cluster period indices, the
+        number of occurrences of the cluster periods, the cluster order and the
+        accuracy indicators of each time series
+    """
+    # identical time series are clustered once. The square root of their number
+    # weights them, so that the distances between the periods are unchanged
+    unique_columns, inverse, counts = find_unique_time_series(df_ts_raw)
+    unique_names = df_ts_raw.columns[unique_columns]
+    # tsam sorts the columns of the time series in place
+    df_ts_unique = df_ts_raw.iloc[:, unique_columns]
+    weights = {
+        column: np.sqrt(count)
+        for column, count in zip(unique_names, counts, strict=True)
+        if count > 1
+    }
+    if len(unique_columns) < df_ts_raw.shape[1]:
+        logging.info(
+            f"Cluster {len(unique_columns)} unique of {df_ts_raw.shape[1]} time series"
+        )
+    if tsa_settings.backend == "numpy":
+        result = cluster_time_series(
+            df_ts_unique, number_typical_periods, tsa_settings, weights
+        )
+    else:
+        result = aggregate_time_series_with_tsam(
+            df_ts_unique, number_typical_periods, tsa_settings, weights
+        )
+    accuracy = accuracy_indicators(
+        df_ts_unique, result["typical_periods"], result["cluster_order"]
+    )
+    # expand the unique time series to all time series
+    result["typical_periods"] = result["typical_periods"][unique_names].iloc[:, inverse]
+    result["typical_periods"].columns = df_ts_raw.columns
+    accuracy = accuracy.loc[unique_names].iloc[inverse]
+    accuracy.index = df_ts_raw.columns
+    result["accuracy_indicators"] = accuracy
+    return result
+
+
+def find_unique_time_series(df_ts_raw):
+    """Finds the identical time series by hashing them.
+
+    :param df_ts_raw: raw time series
+    :return: positions of the unique time series in the order of their first
+        occurrence, position of the unique time series of each time series and
+        number of time series of each unique time series
+    """
+    hashes = pd.util.hash_pandas_object(df_ts_raw.T, index=False).to_numpy()
+    _, first_columns, inverse, counts = np.unique(
+        hashes, return_index=True, return_inverse=True, return_counts=True
+    )
+    # keep the order of the time series
+    order = np.argsort(first_columns)
+    rank = np.argsort(order)
+    unique_columns, inverse, counts = first_columns[order], rank[inverse], counts[order]
+    # the hashes of different time series could collide
+    values = df_ts_raw.to_numpy()
+    if not np.array_equal(
+        values[:, unique_columns][:, inverse], values, equal_nan=True
+    ):
+        logging.warning("Hash collision of time series, all time series are clustered")
+        n_columns = df_ts_raw.shape[1]
+        return np.arange(n_columns), np.arange(n_columns), np.ones(n_columns, int)
+    return unique_columns, inverse, counts
+
+
+def aggregate_time_series_with_tsam(
+    df_ts_raw, number_typical_periods, tsa_settings, weights=None
+):
+    """Clusters the raw time series into typical periods with tsam.
+
+    :param df_ts_raw: raw time series with flat column names
+    :param number_typical_periods: number of typical periods
+    :param tsa_settings: time series aggregation settings
+    :param weights: weights of the time series in the clustering
+    :return: dict with the typical periods, the cluster period indices, the
+        number of occurrences of the cluster periods and the cluster order
+    """
+    # tsam imports scikit-learn, so it is only imported if needed
+    import tsam.timeseriesaggregation as tsam
+
+    # create aggregation object
+    aggregation = tsam.TimeSeriesAggregation(
+        timeSeries=df_ts_raw,
+        noTypicalPeriods=number_typical_periods,
+        hoursPerPeriod=tsa_settings.hoursPerPeriod,
+        resolution=tsa_settings.resolution,
+        clusterMethod=tsa_settings.clusterMethod,
+        solver=tsa_settings.solver,
+        extremePeriodMethod=tsa_settings.extremePeriodMethod,
+        rescaleClusterPeriods=tsa_settings.rescaleClusterPeriods,
+        representationMethod=tsa_settings.representationMethod,
+        weightDict=weights,
+    )
+    # create typical periods
+    typical_periods = aggregation.createTypicalPeriods().reset_index(drop=True)
+    return {
+        "typical_periods": typical_periods,
+        "cluster_period_idx": aggregation.clusterPeriodIdx,
+        "cluster_period_no_occur": aggregation.clusterPeriodNoOccur,
+        "cluster_order": aggregation.clusterOrder,
+    }
@@ -0,0 +1,412 @@
+"""NumPy backend of the time series aggregation.
+
+The backend clusters the representative time steps with k-means or k-medoids on the
+min-max normalised time series. Unlike the hierarchical clustering of tsam, whose
+runtime and memory grow quadratically with the number of time steps, the runtime of
+the backend grows linearly with the number of time steps, so that large models are
+aggregated in seconds.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+# seed of the initialization, so that the aggregation is reproducible
+RANDOM_SEED = 0
+# relative tolerance and maximum number of iterations of the rescaling
+RESCALE_TOLERANCE = 1e-6
+RESCALE_MAX_ITERATIONS = 20
+# maximum number of distances computed at once
+CHUNK_SIZE = 2**22
+
+
+def cluster_time_series(df_ts_raw, number_typical_periods, tsa_settings, weights=None):
+    """Clusters the raw time series into typical periods with NumPy.
+
+    :param df_ts_raw: raw time series with flat column names
+    :param number_typical_periods: number of typical periods
+    :param tsa_settings: time series aggregation settings
+    :param weights: weights of the time series in the clustering, 1 if missing
+    :return: dict with the typical periods, the cluster period indices, the
+        number of occurrences of the cluster periods and the cluster order
+    """
+    if tsa_settings.hoursPerPeriod != 1 or tsa_settings.resolution != 1:
+        raise NotImplementedError(
+            "The numpy backend of the time series aggregation only clusters "
+            "single time steps (hoursPerPeriod = 1, resolution = 1)"
+        )
+    if tsa_settings.clusterMethod not in ["k_means", "k_medoids"]:
+        raise NotImplementedError(
+            f"Cluster method {tsa_settings.clusterMethod} not implemented for the "
+            "numpy backend of the time series aggregation. Use k_means or "
+            "k_medoids"
+        )
+    representation_method = tsa_settings.representationMethod
+    if representation_method is None:
+        if tsa_settings.clusterMethod == "k_means":
+            representation_method = "meanRepresentation"
+        else:
+            representation_method = "medoidRepresentation"
+    if representation_method not in ["meanRepresentation", "medoidRepresentation"]:
+        raise NotImplementedError(
+            f"Representation method {representation_method} not implemented for "
+            "the numpy backend of the time series aggregation"
+        )
+    extreme_period_method = tsa_settings.extremePeriodMethod
+    if extreme_period_method in [None, "None"]:
+        extreme_period_method = None
+    elif extreme_period_method not in ["new_cluster_center", "replace_cluster_center"]:
+        raise NotImplementedError(
+            f"Extreme period method {extreme_period_method} not implemented for the "
+            "numpy backend of the time series aggregation"
+        )
+
+    values = df_ts_raw.to_numpy(dtype=float)
+    normalized = normalize(values)
+    number_periods = len(normalized)
+    # the weighted time series span the distances of the clustering
+    if weights:
+        features = normalized * np.array(
+            [weights.get(column, 1) for column in df_ts_raw.columns]
+        )
+    else:
+        features = normalized
+    rng = np.random.default_rng(RANDOM_SEED)
+    # the peak of each time series is an extreme period
+    extreme_periods = []
+    if extreme_period_method is not None and number_typical_periods > 1:
+        extreme_periods = list(dict.fromkeys(np.argmax(normalized, axis=0).tolist()))
+    # with new cluster centers, the extreme periods are clusters of their own
+    if extreme_period_method == "new_cluster_center":
+        # at most half of the typical periods are extreme periods
+        if len(extreme_periods) > number_typical_periods // 2:
+            logging.warning(
+                f"{len(extreme_periods)} extreme periods exceed half of the "
+                f"{number_typical_periods} typical periods. Only the first "
+                f"{number_typical_periods // 2} extreme periods are preserved"
+            )
+            extreme_periods = extreme_periods[: number_typical_periods // 2]
+        is_clustered = np.ones(number_periods, dtype=bool)
+        is_clustered[extreme_periods] = False
+        number_clusters = number_typical_periods - len(extreme_periods)
+    else:
+        is_clustered = np.ones(number_periods, dtype=bool)
+        number_clusters = number_typical_periods
+    clustered_periods = np.flatnonzero(is_clustered)
+    if tsa_settings.clusterMethod == "k_means":
+        labels = k_means(
+            features[clustered_periods],
+            number_clusters,
+            rng,
+            tsa_settings.maxIterations,
+            tsa_settings.batchSize,
+        )
+    else:
+        labels = k_medoids(
+            features[clustered_periods],
+            number_clusters,
+            rng,
+            tsa_settings.maxIterations,
+        )
+    cluster_order = np.empty(number_periods, dtype=int)
+    cluster_order[clustered_periods] = labels
+    if extreme_period_method == "new_cluster_center":
+        cluster_order[extreme_periods] = np.arange(
+            number_clusters, number_typical_periods
+        )
+    # drop empty clusters and number the clusters by their first occurrence
+    _, first_occurrence, cluster_order = np.unique(
+        cluster_order, return_index=True, return_inverse=True
+    )
+    order = np.argsort(np.argsort(first_occurrence))
+    cluster_order = order[cluster_order]
+    number_clusters = cluster_order.max() + 1
+    # representative values of the clusters
+    if representation_method == "meanRepresentation":
+        typical_normalized = cluster_means(normalized, cluster_order, number_clusters)
+    else:
+        typical_normalized = normalized[
+            cluster_medoids(features, cluster_order, number_clusters)
+        ]
+    # the clusters of the extreme periods are represented by the extreme periods
+    extreme_clusters = np.unique(cluster_order[extreme_periods]).astype(int)
+    for period in extreme_periods:
+        typical_normalized[cluster_order[period]] = normalized[period]
+    cluster_period_no_occur = np.bincount(cluster_order, minlength=number_clusters)
+    if tsa_settings.rescaleClusterPeriods:
+        typical_normalized = rescale(
+            normalized, typical_normalized, cluster_period_no_occur, extreme_clusters
+        )
+    typical_periods = pd.DataFrame(
+        denormalize(typical_normalized, values), columns=df_ts_raw.columns
+    )
+    return {
+        "typical_periods": typical_periods,
+        "cluster_period_idx": list(range(number_clusters)),
+        "cluster_period_no_occur": dict(enumerate(cluster_period_no_occur.tolist())),
+        "cluster_order": cluster_order,
+    }
+
+
+def get_scaling(values):
+    """Returns the minimum and the span of each time series.
+
+    :param values: array of the time steps times the time series
+    :return: minimum and span of each time series, the span of constant time
+        series is 1
+    """
+    minimum = values.min(axis=0)
+    span = values.max(axis=0) - minimum
+    span[span == 0] = 1
+    return minimum, span
+
+
+def normalize(values, scaling_values=None):
+    """Scales each time series to the range between 0 and 1.
+
+    :param values: array of the time steps times the time series
+    :param scaling_values: array whose range is scaled to 0 and 1, values if None
+    :return: normalised array, constant time series are 0
+    """
+    minimum, span = get_scaling(values if scaling_values is None else scaling_values)
+    return (values - minimum) / span
+
+
+def denormalize(normalized, values):
+    """Scales normalised time series back to the range of the original values.
+
+    :param normalized: normalised array
+    :param values: original array that was normalised
+    :return: array in the units of the original values
+    """
+    minimum, span = get_scaling(values)
+    return normalized * span + minimum
+
+
+def squared_distances(points, centers, point_norms=None):
+    """Computes the squared euclidean distances between points and centers.
+
+    :param points: array of the points
+    :param centers: array of the centers
+    :param point_norms: squared norms of the points, computed if None
+    :return: array of the squared distances of each point to each center
+    """
+    if point_norms is None:
+        point_norms = np.einsum("ij,ij->i", points, points)
+    distances = (
+        point_norms[:, None]
+        - 2 * points @ centers.T
+        + np.einsum("ij,ij->i", centers, centers)[None, :]
+    )
+    return np.maximum(distances, 0)
+
+
+def assign(points, centers):
+    """Assigns each point to the closest center, in chunks to bound the memory.
+
+    :param points: array of the points
+    :param centers: array of the centers
+    :return: label of the closest center of each point
+    """
+    chunk = max(1, CHUNK_SIZE // max(1, len(centers)))
+    labels = np.empty(len(points), dtype=int)
+    for start in range(0, len(points), chunk):
+        labels[start : start + chunk] = squared_distances(
+            points[start : start + chunk], centers
+        ).argmin(axis=1)
+    return labels
+
+
+def initialize_centers(points, number_clusters, rng):
+    """Selects the initial centers with k-means++.
+
+    :param points: array of the points
+    :param number_clusters: number of clusters
+    :param rng: random number generator
+    :return: indices of the points that are the initial centers
+    """
+    point_norms = np.einsum("ij,ij->i", points, points)
+    centers = [int(rng.integers(len(points)))]
+    distances = squared_distances(points, points[centers], point_norms).ravel()
+    for _ in range(1, number_clusters):
+        total = distances.sum()
+        # all remaining points coincide with a center
+        if total == 0:
+            break
+        center = int(rng.choice(len(points), p=distances / total))
+        centers.append(center)
+        distances = np.minimum(
+            distances, squared_distances(points, points[[center]], point_norms).ravel()
+        )
+    return centers
+
+
+def cluster_means(points, labels, number_clusters):
+    """Computes the mean of the points of each cluster.
+
+    :param points: array of the points
+    :param labels: cluster of each point
+    :param number_clusters: number of clusters
+    :return: array of the cluster means, 0 for empty clusters
+    """
+    membership = np.zeros((number_clusters, len(points)))
+    membership[labels, np.arange(len(points))] = 1
+    counts = membership.sum(axis=1)
+    return membership @ points / np.maximum(counts, 1)[:, None]
+
+
+def k_means(points, number_clusters, rng, max_iterations, batch_size=None):
+    """Clusters the points with k-means.
+
+    If a batch size smaller than the number of points is given, the centers are
+    updated with mini-batches of random points, before all points are assigned to
+    the closest center.
+
+    :param points: array of the points
+    :param number_clusters: number of clusters
+    :param rng: random number generator
+    :param max_iterations: maximum number of iterations
+    :param batch_size: number of points per mini-batch, all points if None
+    :return: cluster of each point
+    """
+    if number_clusters >= len(points):
+        return np.arange(len(points))
+    centers = points[initialize_centers(points, number_clusters, rng)]
+    if batch_size is not None and batch_size < len(points):
+        counts = np.zeros(len(centers))
+        for _ in range(max_iterations):
+            batch = points[rng.choice(len(points), batch_size, replace=False)]
+            labels = assign(batch, centers)
+            batch_counts = np.bincount(labels, minlength=len(centers))
+            counts += batch_counts
+            # move the centers towards the mean of their points in the batch
+            batch_means = cluster_means(batch, labels, len(centers))
+            step = np.divide(
+                batch_counts, counts, out=np.zeros(len(centers)), where=counts > 0
+            )
+            centers += step[:, None] * (batch_means - centers)
+        labels = assign(points, centers)
+        return labels
+    labels = None
+    for _ in range(max_iterations):
+        new_labels = assign(points, centers)
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=len(centers))
+        centers = np.where(
+            counts[:, None] > 0, cluster_means(points, labels, len(centers)), centers
+        )
+    else:
+        logging.warning(f"k-means did not converge within {max_iterations} iterations")
+    return labels
+
+
+def cluster_medoids(points, labels, number_clusters):
+    """Finds the medoid of each cluster, i.e., the point with the smallest sum of
+    distances to the other points of the cluster.
+
+    :param points: array of the points
+    :param labels: cluster of each point
+    :param number_clusters: number of clusters
+    :return: index of the medoid of each cluster
+    """
+    medoids = np.zeros(number_clusters, dtype=int)
+    for cluster in range(number_clusters):
+        members = np.flatnonzero(labels == cluster)
+        if len(members) == 0:
+            continue
+        member_points = points[members]
+        costs = np.empty(len(members))
+        chunk = max(1, CHUNK_SIZE // len(members))
+        for start in range(0, len(members), chunk):
+            costs[start : start + chunk] = np.sqrt(
+                squared_distances(member_points[start : start + chunk], member_points)
+            ).sum(axis=1)
+        medoids[cluster] = members[np.argmin(costs)]
+    return medoids
+
+
+def k_medoids(points, number_clusters, rng, max_iterations):
+    """Clusters the points with k-medoids by alternating the assignment of the
+    points and the update of the medoids.
+
+    :param points: array of the points
+    :param number_clusters: number of clusters
+    :param rng: random number generator
+    :param max_iterations: maximum number of iterations
+    :return: cluster of each point
+    """
+    if number_clusters >= len(points):
+        return np.arange(len(points))
+    medoids = np.array(initialize_centers(points, number_clusters, rng))
+    labels = None
+    for _ in range(max_iterations):
+        labels = assign(points, points[medoids])
+        new_medoids = cluster_medoids(points, labels, len(medoids))
+        if np.array_equal(medoids, new_medoids):
+            break
+        medoids = new_medoids
+    else:
+        logging.warning(
+            f"k-medoids did not converge within {max_iterations} iterations"
+        )
+    return labels
+
+
+def rescale(normalized, typical_normalized, no_occur, extreme_clusters):
+    """Rescales the typical periods such that the weighted sum of each time series
+    equals the sum of the original time series, without changing the extreme
+    periods. The rescaling follows the one of tsam.
+
+    :param normalized: normalised raw time series
+    :param typical_normalized: normalised typical periods
+    :param no_occur: number of occurrences of each typical period
+    :param extreme_clusters: clusters of the extreme periods
+    :return: rescaled normalised typical periods
+    """
+    typical_normalized = typical_normalized.copy()
+    is_scaled = np.ones(len(typical_normalized), dtype=bool)
+    is_scaled[extreme_clusters] = False
+    sum_raw = normalized.sum(axis=0)
+    sum_peak = no_occur[~is_scaled] @ typical_normalized[~is_scaled]
+    for column in range(normalized.shape[1]):
+        for _ in range(RESCALE_MAX_ITERATIONS):
+            sum_scaled = no_occur[is_scaled] @ typical_normalized[is_scaled, column]
+            diff = abs(sum_raw[column] - sum_scaled - sum_peak[column])
+            if diff <= sum_raw[column] * RESCALE_TOLERANCE or sum_scaled == 0:
+                break
+            typical_normalized[is_scaled, column] *= (
+                sum_raw[column] - sum_peak[column]
+            ) / sum_scaled
+            typical_normalized[:, column] = np.clip(typical_normalized[:, column], 0, 1)
+    return typical_normalized
+
+
+def accuracy_indicators(df_ts_raw, typical_periods, cluster_order):
+    """Compares the time series predicted by the typical periods with the raw time
+    series on the normalised values, as the accuracy indicators of tsam.
+
+    :param df_ts_raw: raw time series
+    :param typical_periods: typical periods
+    :param cluster_order: typical period of each time step
+    :return: dataframe with the RMSE, the RMSE of the duration curves and the MAE
+        of each time series
+    """
+    values = df_ts_raw.to_numpy(dtype=float)
+    original = normalize(values)
+    predicted = typical_periods[df_ts_raw.columns].to_numpy(dtype=float)[
+        np.asarray(cluster_order)
+    ]
+    predicted = normalize(predicted, values)
+    error = predicted - original
+    duration_error = np.sort(predicted, axis=0) - np.sort(original, axis=0)
+    return pd.DataFrame(
+        {
+            "RMSE": np.sqrt((error**2).mean(axis=0)),
+            "RMSE_duration": np.sqrt((duration_error**2).mean(axis=0)),
+            "MAE": np.abs(error).mean(axis=0),
+        },
+        index=df_ts_raw.columns,
+    )
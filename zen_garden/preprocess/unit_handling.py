@@ -1,9 +1,11 @@
 """File which contains the unit handling and scaling class."""
 
+import functools
 import itertools
 import json
 import logging
 import os
+import threading
 import time
 import warnings
 from pathlib import Path
@@ -18,6 +20,25 @@ from zen_garden.model.carrier.carrier import Carrier
 from zen_garden.model.technology.technology import Technology
 from zen_garden.utils import get_label_position
 
+# the unit registry is not thread-safe, so the unit conversions of elements that
+# are read in parallel are serialized
+_unit_lock = threading.RLock()
+
+
+def _synchronized(method):
+    """Decorator that holds the unit lock while the method runs.
+
+    :param method: method to synchronize
+    :return: synchronized method
+    """
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with _unit_lock:
+            return method(*args, **kwargs)
+
+    return wrapper
+
 
 class UnitHandling:
     """A class for managing and converting units in an energy system model.
@@ -38,6 +59,10 @@ class UnitHandling:
           accurately.
     """
 
+    # unit registries and unit conversions, shared by all scenarios in the process
+    _unit_registries = {}
+    _conversion_caches = {}
+
     def __init__(self, folder_path, rounding_decimal_points_units):
         """Initializes an instance of the UnitHandling class.
 
@@ -59,6 +84,46 @@ class UnitHandling:
         self.dict_attribute_values = {}
         self.carrier_energy_quantities = {}
 
+    @staticmethod
+    def create_unit_registry(folder_path):
+        """Creates a unit registry with the standard and the user-defined units.
+
+        The registry is created once per unit definitions file and shared by all
+        scenarios in the process. It is created again if the file changes.
+
+        Args:
+            folder_path (str or Path): The path to the folder containing the
+                "unit_definitions.txt" file.
+
+        Returns:
+            UnitRegistry: The unit registry.
+        """
+        key = UnitHandling._get_registry_key(folder_path)
+        if key not in UnitHandling._unit_registries:
+            ureg = UnitRegistry()
+            # disable pint logger
+            logging.getLogger("pint").setLevel(logging.CRITICAL)
+            # redefine standard units
+            UnitHandling.redefine_standard_units(ureg)
+            # load additional units
+            ureg.load_definitions(Path(folder_path) / "unit_definitions.txt")
+            UnitHandling._unit_registries[key] = ureg
+        return UnitHandling._unit_registries[key]
+
+    @staticmethod
+    def _get_registry_key(folder_path):
+        """Returns the key of the unit registry of a unit definitions file.
+
+        Args:
+            folder_path (str or Path): The path to the folder containing the
+                "unit_definitions.txt" file.
+
+        Returns:
+            tuple: The path and modification time of the unit definitions file.
+        """
+        path = os.path.abspath(Path(folder_path) / "unit_definitions.txt")
+        return path, os.stat(path).st_mtime_ns
+
     def get_base_units(self):
         """Extracts and initializes the base units of the energy system.
 
@@ -76,14 +141,11 @@ class UnitHandling:
                 that can't be resolved.
         """
         _list_base_unit = self.extract_base_units()
-        self.ureg = UnitRegistry()
-
-        # disable pint logger
-        logging.getLogger("pint").setLevel(logging.CRITICAL)
-        # redefine standard units
-        self.redefine_standard_units()
-        # load additional units
-        self.ureg.load_definitions(self.folder_path / "unit_definitions.txt")
+        self.ureg = self.create_unit_registry(self.folder_path)
+        # conversions of input units into the base units
+        self.conversion_cache = UnitHandling._conversion_caches.setdefault(
+            (self._get_registry_key(self.folder_path), tuple(_list_base_unit)), {}
+        )
 
         # empty base units and dimensionality matrix
         self.base_units = {}
@@ -224,6 +286,40 @@ class UnitHandling:
             AssertionError: If the dimensionality of the input unit cannot be
                 matched with base units.
         """
+        conversion = self._get_conversion(input_unit)
+        if return_combination:
+            return conversion["combined_unit"], conversion["base_combination"].copy()
+        else:
+            return conversion["combined_unit"]
+
+    def _get_conversion(self, input_unit):
+        """Returns the cached conversion of an input unit into the base units.
+
+        Args:
+            input_unit (str): The input unit to be converted.
+
+        Returns:
+            dict: The combined unit and the base unit combination of the input
+            unit. The multiplier and the unit in base units are added when they
+            are first requested.
+        """
+        if input_unit not in self.conversion_cache:
+            combined_unit, base_combination = self._calculate_combined_unit(input_unit)
+            self.conversion_cache[input_unit] = {
+                "combined_unit": combined_unit,
+                "base_combination": base_combination,
+            }
+        return self.conversion_cache[input_unit]
+
+    def _calculate_combined_unit(self, input_unit):
+        """Represents the input unit as a combination of base units.
+
+        Args:
+            input_unit (str): The input unit to be converted.
+
+        Returns:
+            tuple: The combined unit and the base unit combination.
+        """
         # check if "h" and thus "planck_constant" in unit
         self.check_if_invalid_hourstring(input_unit)
         # create dimensionality vector for input_unit
@@ -280,10 +376,7 @@ class UnitHandling:
                         input_unit=input_unit,
                     )
                 )
-        if return_combination:
-            return combined_unit, base_combination
-        else:
-            return combined_unit
+        return combined_unit, base_combination
 
     def _get_combined_unit_of_different_matrix(
         self, dim_matrix_reduced, dim_vector, input_unit
@@ -375,10 +468,8 @@ class UnitHandling:
         )
         return base_combination, combined_unit
 
-    # ToDo: check if combined_unit is described correctly in the header
-    def get_unit_multiplier(
-        self, input_unit, attribute_name, path=None, combined_unit=None
-    ):
+    @_synchronized
+    def get_unit_multiplier(self, input_unit, attribute_name, path=None):
         """Calculates the multiplier for converting an input unit into the base
         units.
 
@@ -386,7 +477,8 @@ class UnitHandling:
         the given `input_unit` into a base unit. If the `input_unit` is already
         a base unit, the multiplier is 1. If the `input_unit` is not in base
         units, it computes the conversion using dimensional analysis and ensures
-        that the resulting multiplier meets the rounding tolerance.
+        that the resulting multiplier meets the rounding tolerance. The
+        multiplier is cached per input unit.
 
         Args:
             input_unit (str): The unit to be converted (e.g., "kg", "m/s").
@@ -394,8 +486,6 @@ class UnitHandling:
                 corresponds to.
             path (str, optional): The file path associated with the unit
                 (for logging purposes).
-            combined_unit (pint.Quantity, optional): The combined unit in
-                base units. If provided, skips recomputing the combined unit.
 
         Returns:
             float:
@@ -424,15 +514,19 @@ class UnitHandling:
             # if input unit is 1 --> dimensionless new definition
             if input_unit == "1":
                 return 1
-            if not combined_unit:
-                combined_unit = self.calculate_combined_unit(input_unit)
-            assert combined_unit.to_base_units().unitless, (
-                f"The unit conversion of unit {input_unit} did not "
-                "resolve to a dimensionless conversion factor. "
-                "Something went wrong."
-            )
-            # magnitude of combined unit is multiplier
-            multiplier = combined_unit.to_base_units().magnitude
+            conversion = self._get_conversion(input_unit)
+            if "multiplier" not in conversion:
+                combined_unit_in_base_units = conversion[
+                    "combined_unit"
+                ].to_base_units()
+                assert combined_unit_in_base_units.unitless, (
+                    f"The unit conversion of unit {input_unit} did not "
+                    "resolve to a dimensionless conversion factor. "
+                    "Something went wrong."
+                )
+                # magnitude of combined unit is multiplier
+                conversion["multiplier"] = combined_unit_in_base_units.magnitude
+            multiplier = conversion["multiplier"]
             # check that multiplier is larger than rounding tolerance
             assert multiplier >= 10 ** (-self.rounding_decimal_points_units), (
                 f"Multiplier {multiplier} of unit {input_unit} in parameter "
@@ -442,6 +536,7 @@ class UnitHandling:
             # round to decimal points
             return round(multiplier, self.rounding_decimal_points_units)
 
+    @_synchronized
     def convert_unit_into_base_units(
         self, input_unit, get_multiplier=False, attribute_name=None, path=None
     ):
@@ -470,21 +565,20 @@ class UnitHandling:
                 and the base units as a `pint.Quantity`.
         """
         # convert attribute unit into unit combination of base units
-        combined_unit = None
         attribute_unit_in_base_units = self.ureg("")
         if input_unit != "1" and not pd.isna(input_unit):
-            combined_unit, base_combination = self.calculate_combined_unit(
-                input_unit, return_combination=True
-            )
-            for unit, power in zip(
-                base_combination.index, base_combination, strict=False
-            ):
-                attribute_unit_in_base_units *= self.ureg(unit) ** power
+            conversion = self._get_conversion(input_unit)
+            if "unit_in_base_units" not in conversion:
+                base_combination = conversion["base_combination"]
+                for unit, power in zip(
+                    base_combination.index, base_combination, strict=False
+                ):
+                    attribute_unit_in_base_units *= self.ureg(unit) ** power
+                conversion["unit_in_base_units"] = attribute_unit_in_base_units
+            attribute_unit_in_base_units = conversion["unit_in_base_units"]
         # calculate the multiplier to convert the attribute unit into base units
         if get_multiplier:
-            multiplier = self.get_unit_multiplier(
-                input_unit, attribute_name, path, combined_unit=combined_unit
-            )
+            multiplier = self.get_unit_multiplier(input_unit, attribute_name, path)
             return multiplier, attribute_unit_in_base_units
         else:
             return attribute_unit_in_base_units
@@ -1289,15 +1383,19 @@ class UnitHandling:
         """
         self.ureg.define("ton = metric_ton")
 
-    def redefine_standard_units(self):
+    @staticmethod
+    def redefine_standard_units(ureg):
         """Redefines standard units required in the system.
 
         This method sets up standard units such as "Euro", "year", and "ton",
         and ensures that the system handles leap years correctly.
+
+        Args:
+            ureg (UnitRegistry): The unit registry in which the units are defined.
         """
-        self.ureg.define("Euro = [currency] = EURO = Eur = €")
-        self.ureg.define("year = 365 * day = a = yr = julian_year")
-        self.ureg.define("ton = metric_ton")
+        ureg.define("Euro = [currency] = EURO = Eur = €")
+        ureg.define("year = 365 * day = a = yr = julian_year")
+        ureg.define("ton = metric_ton")
 
     @staticmethod
     def check_pos_neg_boolean(array, axis=None):
@@ -6,21 +6,32 @@ import importlib
 import importlib.util
 import json
 import logging
+import multiprocessing
 import os
+import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 import zen_garden.default_config as default_config
 
 from .optimization_setup import OptimizationSetup
-from .postprocess.postprocess import Postprocess
-from .utils import InputDataChecks, ScenarioUtils, StringUtils, setup_logger
+from .postprocess.postprocess import Postprocess, PostprocessWriter
+from .preprocess.model_cache import ModelCache
+from .utils import InputDataChecks, ScenarioUtils, StringUtils, Tracer, setup_logger
 
 # we setup the logger here
 setup_logger()
 
 
-def run(config="./config.json", dataset=None, job_index=None, folder_output=None):
+def run(
+    config="./config.json",
+    dataset=None,
+    job_index=None,
+    folder_output=None,
+    n_workers=None,
+):
     """Run ZEN-garden.
 
     This function is the primary programmatic entry point for running
@@ -41,9 +52,17 @@ def run(config="./config.json", dataset=None, job_index=None, folder_output=None
         job_index (list[int] | None): Indices of jobs (scenarios) to run.
             For example, ``job_index=[1]`` runs only the first scenario.
             Defaults to ``None`` (run all jobs).
+        n_workers (int | None): Number of processes used to solve the
+            scenarios in parallel. Defaults to
+            ``config.system.n_parallel_scenarios``. The worker processes are
+            spawned, so scripts that run scenarios in parallel must call
+            ``run`` under an ``if __name__ == "__main__":`` guard.
 
     Returns:
-        OptimizationSetup: The fully set up and solved optimization problem.
+        OptimizationSetup | dict: The fully set up and solved optimization
+        problem of the last scenario. If the scenarios are solved in
+        parallel, a dictionary with the status of each scenario is returned
+        instead.
 
     Examples:
         >>> from zen_garden import run, download_example_dataset
@@ -118,32 +137,120 @@ def run(config="./config.json", dataset=None, job_index=None, folder_output=None
     # clean sub-scenarios if necessary
     ScenarioUtils.clean_scenario_folder(config, out_folder)
     ### ITERATE THROUGH SCENARIOS
-    for scenario, scenario_dict in zip(scenarios, elements, strict=False):
-        # FORMULATE THE OPTIMIZATION PROBLEM
-        # add the scenario_dict and read input data
-        optimization_setup = OptimizationSetup(
-            config, scenario_dict=scenario_dict, input_data_checks=input_data_checks
+    if n_workers is None:
+        n_workers = config.system.n_parallel_scenarios
+    n_workers = min(n_workers, len(scenarios))
+    if n_workers > 1:
+        scenario_status = _run_scenarios_parallel(
+            config, scenarios, elements, input_data_checks, model_name, n_workers
         )
-        # get rolling horizon years
-        steps_horizon = optimization_setup.get_optimization_horizon()
-        # iterate through horizon steps
-        for step in steps_horizon:
-            StringUtils.print_optimization_progress(
-                scenario, steps_horizon, step, system=config.system
+        logging.info("--- Optimization finished ---")
+        return scenario_status
+    # write the results in the background while the next step is constructed
+    writer = None
+    if config.analysis.postprocess_in_background:
+        writer = PostprocessWriter()
+    warm_start_solution = None
+    try:
+        for scenario, scenario_dict in zip(scenarios, elements, strict=False):
+            optimization_setup, _ = _run_scenario(
+                config,
+                scenario,
+                scenario_dict,
+                input_data_checks,
+                model_name,
+                warm_start_solution=warm_start_solution,
+                writer=writer,
             )
+            warm_start_solution = optimization_setup.warm_start_solution
+    except BaseException:
+        # an error of the writer must not mask the error of the optimization
+        if writer is not None:
+            writer.join(raise_error=False)
+        raise
+    if writer is not None:
+        writer.join()
+    logging.info("--- Optimization finished ---")
+    return optimization_setup
+
+
+def _run_scenario(
+    config,
+    scenario,
+    scenario_dict,
+    input_data_checks,
+    model_name,
+    warm_start_solution=None,
+    writer=None,
+):
+    """Formulates, solves and postprocesses a single scenario.
+
+    Args:
+        config (Config): The fully resolved configuration of the run.
+        scenario (str): Name of the scenario.
+        scenario_dict (dict): Scenario dictionary of the scenario.
+        input_data_checks (InputDataChecks): Input data checks of the run.
+        model_name (str): Name of the model used for the output folder.
+        warm_start_solution (xr.Dataset | None): Solution of a previous scenario
+            used to warm start the first solve if ``solver.warm_start`` is set.
+        writer (PostprocessWriter | None): Writer to write the results in the
+            background. If None, the results are written directly.
+
+    Returns:
+        tuple: The OptimizationSetup of the scenario and the termination
+        condition of the last solved horizon step.
+    """
+    # trace the wall time, CPU time and memory usage of the phases
+    tracer = Tracer(f"scenario_{scenario}" if scenario else "scenario")
+    # load the constructed optimization problem from the cache if available
+    model_cache = None
+    optimization_setup = None
+    if config.solver.use_model_cache and not config.system.use_rolling_horizon:
+        model_cache = ModelCache(config, scenario_dict)
+        with tracer.span("load_model_cache"):
+            optimization_setup = model_cache.load(config)
+    is_cached = optimization_setup is not None
+    # FORMULATE THE OPTIMIZATION PROBLEM
+    # add the scenario_dict and read input data
+    if not is_cached:
+        with tracer.span("preprocess"):
+            optimization_setup = OptimizationSetup(
+                config,
+                scenario_dict=scenario_dict,
+                input_data_checks=input_data_checks,
+                tracer=tracer,
+            )
+    else:
+        optimization_setup.tracer = tracer
+    optimization_setup.warm_start_solution = warm_start_solution
+    # get rolling horizon years
+    steps_horizon = optimization_setup.get_optimization_horizon()
+    # iterate through horizon steps
+    for step in steps_horizon:
+        StringUtils.print_optimization_progress(
+            scenario, steps_horizon, step, system=config.system
+        )
+        with tracer.span(f"step_{step}"):
             # overwrite time indices
             optimization_setup.overwrite_time_indices(step)
             # create optimization problem
-            optimization_setup.construct_optimization_problem()
-            if optimization_setup.solver.use_scaling:
-                optimization_setup.scaling.run_scaling()
-            elif (
-                optimization_setup.solver.analyze_numerics
-                or optimization_setup.solver.run_diagnostics
-            ):
-                optimization_setup.scaling.analyze_numerics()
+            if not is_cached:
+                with tracer.span("construct"):
+                    optimization_setup.construct_optimization_problem()
+                if model_cache is not None:
+                    with tracer.span("save_model_cache"):
+                        model_cache.save(optimization_setup)
+            with tracer.span("scaling"):
+                if optimization_setup.solver.use_scaling:
+                    optimization_setup.scaling.run_scaling()
+                elif (
+                    optimization_setup.solver.analyze_numerics
+                    or optimization_setup.solver.run_diagnostics
+                ):
+                    optimization_setup.scaling.analyze_numerics()
             # SOLVE THE OPTIMIZATION PROBLEM
-            optimization_setup.solve()
+            with tracer.span("solve"):
+                optimization_setup.solve()
             # break if infeasible
             if not optimization_setup.optimality:
                 # write IIS
@@ -152,12 +259,15 @@ def run(config="./config.json", dataset=None, job_index=None, folder_output=None
                     f"Optimization: {optimization_setup.model.termination_condition}"
                 )
                 break
-            if optimization_setup.solver.use_scaling:
-                optimization_setup.scaling.re_scale()
+            with tracer.span("re_scale"):
+                if optimization_setup.solver.use_scaling:
+                    optimization_setup.scaling.re_scale()
+                optimization_setup.save_warm_start_solution()
             # save new capacity additions and cumulative carbon emissions
             # for next time step
             if optimization_setup.system.use_rolling_horizon:
-                optimization_setup.add_results_of_optimization_step(step)
+                with tracer.span("add_results_of_optimization_step"):
+                    optimization_setup.add_results_of_optimization_step(step)
             # EVALUATE RESULTS
             # create scenario name, subfolder and param_map for postprocessing
             scenario_name, subfolder, param_map = StringUtils.generate_folder_path(
@@ -168,13 +278,149 @@ def run(config="./config.json", dataset=None, job_index=None, folder_output=None
                 step=step,
             )
             # write results
-            Postprocess(
-                optimization_setup,
-                scenarios=config.scenarios,
-                subfolder=subfolder,
-                model_name=model_name,
-                scenario_name=scenario_name,
-                param_map=param_map,
+            with tracer.span("postprocess"):
+                Postprocess(
+                    optimization_setup,
+                    scenarios=config.scenarios,
+                    subfolder=subfolder,
+                    model_name=model_name,
+                    scenario_name=scenario_name,
+                    param_map=param_map,
+                    writer=writer,
+                )
+    if optimization_setup.solver.run_diagnostics:
+        _write_trace(tracer, config, scenario, scenario_dict, model_name)
+    return optimization_setup, str(optimization_setup.model.termination_condition)
+
+
+def _write_trace(tracer, config, scenario, scenario_dict, model_name):
+    """Writes the trace of a scenario to ``trace.json`` in the scenario folder.
+
+    Without the rolling horizon, this is the folder of ``benchmarking.json``.
+    With the rolling horizon, it is the parent folder of the horizon steps. The
+    constraint rules sorted by their construction time are written to
+    ``constraint_rules.csv``.
+
+    Args:
+        tracer (Tracer): Tracer of the scenario.
+        config (Config): The fully resolved configuration of the run.
+        scenario (str): Name of the scenario.
+        scenario_dict (dict): Scenario dictionary of the scenario.
+        model_name (str): Name of the model used for the output folder.
+    """
+    _, subfolder, _ = StringUtils.generate_folder_path(
+        config=config,
+        scenario=scenario,
+        scenario_dict=scenario_dict,
+        steps_horizon=[0],
+        step=0,
+    )
+    folder = Path(config.analysis.folder_output).joinpath(model_name, subfolder)
+    os.makedirs(folder, exist_ok=True)
+    tracer.write(folder.joinpath("trace.json"))
+    tracer.get_rule_report().to_csv(folder.joinpath("constraint_rules.csv"))
+
+
+def _run_scenario_in_worker(
+    config, scenario, scenario_dict, input_data_checks, model_name
+):
+    """Runs a single scenario in a worker process of the process pool.
+
+    Each scenario writes the solver files to its own subfolder of
+    ``config.solver.solver_dir`` so that parallel solves do not interfere.
+
+    Args:
+        config (Config): The fully resolved configuration of the run.
+        scenario (str): Name of the scenario.
+        scenario_dict (dict): Scenario dictionary of the scenario.
+        input_data_checks (InputDataChecks): Input data checks of the run.
+        model_name (str): Name of the model used for the output folder.
+
+    Returns:
+        dict: Status of the scenario with the keys ``status``,
+        ``termination_condition``, ``time`` and ``error``.
+    """
+    config.solver.solver_dir = os.path.join(
+        config.solver.solver_dir, f"scenario_{scenario}"
+    )
+    t_start = time.perf_counter()
+    try:
+        optimization_setup, termination_condition = _run_scenario(
+            config, scenario, scenario_dict, input_data_checks, model_name
+        )
+    except Exception as e:
+        logging.exception(f"Scenario {scenario} failed")
+        return {
+            "status": "failed",
+            "termination_condition": None,
+            "time": time.perf_counter() - t_start,
+            "error": f"{type(e).__name__}: {e}",
+        }
+    return {
+        "status": "optimal" if optimization_setup.optimality else "not optimal",
+        "termination_condition": termination_condition,
+        "time": time.perf_counter() - t_start,
+        "error": None,
+    }
+
+
+def _run_scenarios_parallel(
+    config, scenarios, elements, input_data_checks, model_name, n_workers
+):
+    """Dispatches the scenarios to a pool of worker processes.
+
+    The scenarios are solved independently of each other, each in a fresh
+    OptimizationSetup. Shared output files such as ``scenarios.json`` and
+    the ``param_map`` are written under a file lock by the postprocessing.
+
+    Args:
+        config (Config): The fully resolved configuration of the run.
+        scenarios (list[str]): Names of the scenarios to run.
+        elements (list[dict]): Scenario dictionaries of the scenarios.
+        input_data_checks (InputDataChecks): Input data checks of the run.
+        model_name (str): Name of the model used for the output folder.
+        n_workers (int): Number of worker processes.
+
+    Returns:
+        dict: Status of each scenario, see ``_run_scenario_in_worker``.
+    """
+    logging.info(f"Running {len(scenarios)} scenarios on {n_workers} processes")
+    scenario_status = {}
+    # spawn fresh workers, forking after linopy wrote a model can deadlock them
+    with ProcessPoolExecutor(
+        max_workers=n_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {
+            executor.submit(
+                _run_scenario_in_worker,
+                config,
+                scenario,
+                scenario_dict,
+                input_data_checks,
+                model_name,
+            ): scenario
+            for scenario, scenario_dict in zip(scenarios, elements, strict=False)
+        }
+        for future in as_completed(futures):
+            scenario = futures[future]
+            try:
+                scenario_status[scenario] = future.result()
+            except BrokenProcessPool as e:
+                logging.error(f"The worker process of scenario {scenario} died")
+                scenario_status[scenario] = {
+                    "status": "failed",
+                    "termination_condition": None,
+                    "time": None,
+                    "error": f"{type(e).__name__}: {e}",
+                }
+                continue
+            logging.info(
+                f"Scenario {scenario}: {scenario_status[scenario]['status']} "
+                f"({scenario_status[scenario]['time']:.1f} s)"
             )
-    logging.info("--- Optimization finished ---")
-    return optimization_setup
+    # keep the order of the scenarios
+    scenario_status = {scenario: scenario_status[scenario] for scenario in scenarios}
+    failed = [s for s, status in scenario_status.items() if status["error"]]
+    if failed:
+        logging.error(f"The following scenarios failed: {failed}")
+    return scenario_status
@@ -8,9 +8,13 @@ import os
 import re
 import shutil
 import sys
+import time
 import warnings
 import zipfile
+from bisect import bisect_right
 from collections import defaultdict
+from collections.abc import ItemsView, KeysView, Mapping, ValuesView
+from contextlib import contextmanager
 from copy import deepcopy
 from importlib.metadata import metadata
 from pathlib import Path
@@ -18,11 +22,13 @@ from pathlib import Path
 import linopy as lp
 import numpy as np
 import pandas as pd
+import psutil
 import requests
 import xarray as xr
 from ordered_set import OrderedSet
 
 from zen_garden.default_config import Subscriptable
+from zen_garden.preprocess.dataset_index import DatasetIndex
 
 
 def setup_logger(level=logging.INFO):
@@ -1019,6 +1025,314 @@ class ScenarioDict(dict):
             )
 
 
+class ExpandedScenarios(Mapping):
+    """Lazy mapping of the scenarios after the expansion of the parameter lists.
+
+    The scenarios are the same as those of ``ScenarioDict.expand_lists`` in the same
+    order. Instead of the full product of the parameter lists, only the lists of
+    each base scenario are stored. A scenario is created from its position when it
+    is accessed, such that the memory does not grow with the number of scenarios.
+    The position of the scenarios of each base scenario is given by the parameter
+    lists as digits, where the first list changes slowest.
+    """
+
+    def __init__(self, scenarios: dict):
+        """Initializes the lazy expansion of the scenarios.
+
+        :param scenarios: The initial dict of scenarios
+        """
+        # list of tuples of name, base scenario, lists and expanded scenarios
+        self._bases = []
+        # position of the first scenario of each base scenario
+        self._starts = []
+        self._len = 0
+        # param_map of each base scenario, created on first use
+        self._param_maps = {}
+        # position of each scenario name, created on first lookup by name
+        self._positions = None
+        for scenario_name, scenario_dict in sorted(
+            scenarios.items(), key=lambda x: x[0]
+        ):
+            assert (
+                type(scenario_dict) is dict
+            ), f"Scenario {scenario_name} is not a dictionary!"
+            base = deepcopy(scenario_dict)
+            base["base_scenario"] = scenario_name
+            base["sub_folder"] = ""
+            base["param_map"] = dict()
+            dims = self._get_dims(base)
+            if dims is None:
+                # the lists cannot be expanded lazily, e.g., lists of lists
+                expanded = ScenarioDict._expand_scenario(base)
+                size = len(expanded)
+            else:
+                expanded = None
+                size = int(np.prod([len(dim[3]) for dim in dims]))
+            self._starts.append(self._len)
+            self._bases.append((scenario_name, base, dims, expanded))
+            self._len += size
+
+    @staticmethod
+    def _get_dims(scenario):
+        """Returns the parameter lists of a base scenario in the order of expansion.
+
+        The values of the settings that are not expanded are set in the scenario.
+
+        :param scenario: The base scenario
+        :return: list of tuples of element, parameter, key, values, names and whether
+            the element is a setting or None if the lists cannot be expanded lazily
+        """
+        dims = []
+        counter = 0
+        for element, element_dict in sorted(scenario.items(), key=lambda x: x[0]):
+            if element in ScenarioDict._special_elements:
+                continue
+            is_setting = element in ScenarioDict._setting_elements
+            for param, param_dict in sorted(element_dict.items(), key=lambda x: x[0]):
+                if not isinstance(param_dict, dict):
+                    if is_setting:
+                        continue
+                    return None
+                if is_setting and not isinstance(param_dict["value"], list):
+                    scenario[element][param] = param_dict["value"]
+                for key in sorted(ScenarioDict._param_dict_keys):
+                    if key not in param_dict or not isinstance(param_dict[key], list):
+                        continue
+                    values = param_dict[key]
+                    if any(isinstance(value, list) for value in values):
+                        return None
+                    if key + "_fmt" in param_dict:
+                        if "{}" not in param_dict[key + "_fmt"]:
+                            raise SyntaxError(
+                                "When setting a format for a name, you need to "
+                                "include a placeholder '{}' for its value! No "
+                                f"placeholder found for {key} in {param} in "
+                                f"{element} in {scenario['base_scenario']}"
+                            )
+                        names = [param_dict[key + "_fmt"].format(v) for v in values]
+                    else:
+                        names = [
+                            f"p{counter:02d}_{num:03d}" for num in range(len(values))
+                        ]
+                        counter += 1
+                    if len(set(names)) < len(names):
+                        return None
+                    dims.append((element, param, key, values, names, is_setting))
+                    # a setting is replaced by its value after the first expansion
+                    if is_setting:
+                        break
+        return dims
+
+    def __len__(self):
+        """Returns the number of scenarios."""
+        return self._len
+
+    def __iter__(self):
+        """Iterates over the names of the scenarios."""
+        for position in range(self._len):
+            yield self._get_name(*self._locate(position))
+
+    def __getitem__(self, name):
+        """Returns the scenario of a name.
+
+        :param name: name of the scenario
+        :return: dict of the scenario
+        """
+        if self._positions is None:
+            self._positions = {key: position for position, key in enumerate(self)}
+        return self.get_scenario(self._positions[name])
+
+    def __contains__(self, name):
+        """Checks if a scenario exists.
+
+        :param name: name of the scenario
+        :return: True if the scenario exists
+        """
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def keys(self):
+        """Returns the names of the scenarios."""
+        return KeysView(self)
+
+    def values(self):
+        """Returns the scenarios."""
+        return _ExpandedScenariosValues(self)
+
+    def items(self):
+        """Returns the names and the scenarios."""
+        return _ExpandedScenariosItems(self)
+
+    def get_name(self, position):
+        """Returns the name of the scenario at a position.
+
+        :param position: position of the scenario, negative positions count from
+            the end
+        :return: name of the scenario
+        """
+        return self._get_name(*self._locate(position))
+
+    def get_scenario(self, position):
+        """Returns the scenario at a position.
+
+        :param position: position of the scenario, negative positions count from
+            the end
+        :return: dict of the scenario
+        """
+        base_index, digits = self._locate(position)
+        _, base, dims, expanded = self._bases[base_index]
+        if expanded is not None:
+            return expanded[digits]
+        scenario = deepcopy({k: v for k, v in base.items() if k != "param_map"})
+        for (element, param, key, values, _, is_setting), num in zip(
+            dims, digits, strict=True
+        ):
+            if is_setting:
+                scenario[element][param] = values[num]
+            else:
+                scenario[element][param][key] = values[num]
+                scenario[element][param].pop(key + "_fmt", None)
+        scenario["sub_folder"] = self._get_sub_folder(dims, digits)
+        scenario["param_map"] = self._get_param_map(base_index)
+        # keep the order of the keys of the base scenario
+        return {k: scenario[k] for k in base}
+
+    def _locate(self, position):
+        """Returns the base scenario and the digits of a position.
+
+        :param position: position of the scenario
+        :return: index of the base scenario and the index of the value of each list
+            or the index of the expanded scenario
+        """
+        if position < 0:
+            position += self._len
+        if not 0 <= position < self._len:
+            raise IndexError(f"Scenario index {position} out of range")
+        # the last base scenario that starts before the position is never empty
+        base_index = bisect_right(self._starts, position) - 1
+        local = position - self._starts[base_index]
+        dims = self._bases[base_index][2]
+        if dims is None:
+            return base_index, local
+        digits = []
+        for dim in reversed(dims):
+            local, num = divmod(local, len(dim[3]))
+            digits.append(num)
+        return base_index, tuple(reversed(digits))
+
+    def _get_name(self, base_index, digits):
+        """Returns the name of a scenario.
+
+        :param base_index: index of the base scenario
+        :param digits: index of the value of each list or of the expanded scenario
+        :return: name of the scenario
+        """
+        base_name, _, dims, expanded = self._bases[base_index]
+        if expanded is not None:
+            sub_folder = expanded[digits]["sub_folder"]
+        else:
+            sub_folder = self._get_sub_folder(dims, digits)
+        if sub_folder == "":
+            return base_name
+        return base_name + "_" + sub_folder
+
+    @staticmethod
+    def _get_sub_folder(dims, digits):
+        """Returns the sub folder of a scenario.
+
+        :param dims: lists of the base scenario
+        :param digits: index of the value of each list
+        :return: sub folder of the scenario
+        """
+        return "_".join(dim[4][num] for dim, num in zip(dims, digits, strict=True))
+
+    def _get_param_map(self, base_index):
+        """Returns the param_map of a base scenario, which is shared by its scenarios.
+
+        :param base_index: index of the base scenario
+        :return: dict of the sub folders and their parameter values
+        """
+        if base_index not in self._param_maps:
+            dims = self._bases[base_index][2]
+            param_map = dict()
+            if dims:
+                for digits in np.ndindex(*[len(dim[3]) for dim in dims]):
+                    entry = dict()
+                    for (element, param, key, values, _, is_setting), num in zip(
+                        dims, digits, strict=True
+                    ):
+                        if is_setting:
+                            entry.setdefault(element, dict())[param] = values[num]
+                        else:
+                            entry.setdefault(element, dict()).setdefault(param, dict())[
+                                key
+                            ] = values[num]
+                    param_map[self._get_sub_folder(dims, digits)] = entry
+            self._param_maps[base_index] = param_map
+        return self._param_maps[base_index]
+
+    def write_json(self, file, indent=2):
+        """Writes the scenarios to a json file one scenario at a time.
+
+        The file is the same as ``json.dump(dict(self), file, indent=indent)``. The
+        param_map of each base scenario is serialized only once.
+
+        :param file: file object opened for writing
+        :param indent: indentation of the json file
+        """
+        if self._len == 0:
+            file.write("{}")
+            return
+        pad = " " * indent
+        serialized_param_maps = {}
+        file.write("{")
+        for position in range(self._len):
+            base_index, digits = self._locate(position)
+            scenario = self.get_scenario(position)
+            if base_index not in serialized_param_maps:
+                serialized_param_maps[base_index] = json.dumps(
+                    scenario["param_map"], indent=indent
+                ).replace("\n", "\n" + pad * 2)
+            lines = []
+            for key, value in scenario.items():
+                if key == "param_map":
+                    serialized = serialized_param_maps[base_index]
+                else:
+                    serialized = json.dumps(value, indent=indent).replace(
+                        "\n", "\n" + pad * 2
+                    )
+                lines.append(f"\n{pad * 2}{json.dumps(key)}: {serialized}")
+            name = self._get_name(base_index, digits)
+            if lines:
+                serialized_scenario = "{" + ",".join(lines) + f"\n{pad}}}"
+            else:
+                serialized_scenario = "{}"
+            separator = "," if position > 0 else ""
+            file.write(f"{separator}\n{pad}{json.dumps(name)}: {serialized_scenario}")
+        file.write("\n}")
+
+
+class _ExpandedScenariosValues(ValuesView):
+    """Scenarios of the expanded scenarios, created by position."""
+
+    def __iter__(self):
+        """Iterates over the scenarios."""
+        for position in range(len(self._mapping)):
+            yield self._mapping.get_scenario(position)
+
+
+class _ExpandedScenariosItems(ItemsView):
+    """Names and scenarios of the expanded scenarios, created by position."""
+
+    def __iter__(self):
+        """Iterates over the names and the scenarios."""
+        for position in range(len(self._mapping)):
+            yield self._mapping.get_name(position), self._mapping.get_scenario(position)
+
+
 class InputDataChecks:
     """This class checks if the input data (folder/file structure, system.py settings,
     element definitions, etc.) is defined correctly.
@@ -1129,24 +1443,26 @@ class InputDataChecks:
         """Checks if the primary folder structure (set_conversion_technology,
         set_transport_technology, ..., energy_system) is provided correctly.
         """
+        dataset_index = DatasetIndex.get(self.analysis.dataset)
         for set_name, subsets in self.analysis.subsets.model_dump().items():
-            if not os.path.exists(os.path.join(self.analysis.dataset, set_name)):
+            if not dataset_index.exists(os.path.join(self.analysis.dataset, set_name)):
                 raise AssertionError(f"Folder {set_name} does not exist!")
             if isinstance(subsets, dict):
                 for subset_name, _subset in subsets.items():
-                    if not os.path.exists(
+                    if not dataset_index.exists(
                         os.path.join(self.analysis.dataset, set_name, subset_name)
                     ):
                         raise AssertionError(f"Folder {subset_name} does not exist!")
                 else:
                     for subset_name in subsets:
-                        if not os.path.exists(
+                        if not dataset_index.exists(
                             os.path.join(self.analysis.dataset, set_name, subset_name)
                         ):
                             raise AssertionError(
                                 f"Folder {subset_name} does not exist!"
                             )
 
+        energy_system_folder = os.path.join(self.analysis.dataset, "energy_system")
         for file_name in [
             "attributes.json",
             "base_units.csv",
@@ -1154,10 +1470,10 @@ class InputDataChecks:
             "set_nodes.csv",
             "unit_definitions.txt",
         ]:
-            if file_name not in os.listdir(
-                os.path.join(self.analysis.dataset, "energy_system")
-            ) and file_name.replace(".csv", ".json") not in os.listdir(
-                os.path.join(self.analysis.dataset, "energy_system")
+            if not dataset_index.has_file(
+                energy_system_folder, file_name
+            ) and not dataset_index.has_file(
+                energy_system_folder, file_name.replace(".csv", ".json")
             ):
                 raise FileNotFoundError(
                     f"File {file_name} is missing in the energy_system directory"
@@ -1626,8 +1942,8 @@ class ScenarioUtils:
             if not config.system.run_default_scenario and "" in config.scenarios:
                 del config.scenarios[""]
 
-            # expand the scenarios
-            config.scenarios = ScenarioDict.expand_lists(config.scenarios)
+            # expand the scenarios, each scenario is created when it is accessed
+            config.scenarios = ExpandedScenarios(config.scenarios)
 
             # deal with the job array
             if job_index is not None:
@@ -1637,8 +1953,8 @@ class ScenarioUtils:
                     job_index = list(job_index)
                 logging.info(f"Running scenarios with job indices: {job_index}")
                 # reduce the scenario and element to a single one
-                scenarios = [list(config.scenarios.keys())[jx] for jx in job_index]
-                elements = [list(config.scenarios.values())[jx] for jx in job_index]
+                scenarios = [config.scenarios.get_name(jx) for jx in job_index]
+                elements = [config.scenarios.get_scenario(jx) for jx in job_index]
             else:
                 logging.info("Running all scenarios sequentially")
                 scenarios = config.scenarios.keys()
@@ -1650,6 +1966,172 @@ class ScenarioUtils:
         return scenarios, elements
 
 
+class Tracer:
+    """Records nested spans of the pipeline with wall time, CPU time and memory.
+
+    The spans form a tree, e.g., scenario -> horizon step -> phase -> element class
+    -> constraint rule. Each span stores its wall time and the CPU time of the
+    process in seconds and the resident set size (RSS) at its start and end and the
+    peak RSS within the span in MB. On linux, the peak RSS of the process is reset
+    at the start of each span. On other platforms, the peak RSS is the maximum RSS
+    observed at the start and end of the span and its children.
+    """
+
+    def __init__(self, name):
+        """Initializes the tracer and starts the root span.
+
+        :param name: name of the root span
+        """
+        self.can_reset_peak_rss = self._reset_peak_rss()
+        self.root = self._start_span(name)
+        self._stack = [self.root]
+
+    @contextmanager
+    def span(self, name):
+        """Context manager that records a child span of the current span.
+
+        :param name: name of the span
+        :return: dictionary of the span
+        """
+        parent = self._stack[-1]
+        # keep the peak of the parent before it is reset for the child
+        parent["_peak_rss"] = max(parent["_peak_rss"], self._get_peak_rss())
+        record = self._start_span(name)
+        parent["children"].append(record)
+        self._stack.append(record)
+        try:
+            yield record
+        finally:
+            self._stop_span(record)
+            self._stack.pop()
+            parent["_peak_rss"] = max(parent["_peak_rss"], record["peak_rss"])
+
+    def to_dict(self, record=None):
+        """Returns the spans as a nested dictionary.
+
+        Spans that are still open are reported up to the current time.
+
+        :param record: span to convert, the root span if None
+        :return: dictionary of the span and its children
+        """
+        if record is None:
+            record = self.root
+        if "wall_time" not in record:
+            record = self._stop_span(dict(record))
+        span = {k: v for k, v in record.items() if not k.startswith("_")}
+        span["children"] = [self.to_dict(child) for child in record["children"]]
+        return span
+
+    def get_rule_report(self, record=None):
+        """Returns the constraint rules sorted by their construction time.
+
+        The spans of the constraint rules are summed over the element classes and
+        horizon steps they are called in.
+
+        :param record: span to search for constraint rules, the root span if None
+        :return: data frame with the wall time, CPU time, rows, nonzero terms, bytes
+            and added constraints of each rule
+        """
+        if record is None:
+            record = self.root
+        columns = ["wall_time", "cpu_time", "rows", "nonzeros", "nbytes"]
+        report = {}
+        stack = [record]
+        while stack:
+            span = stack.pop()
+            stack.extend(span["children"])
+            if "constraints" not in span:
+                continue
+            if span["name"] not in report:
+                report[span["name"]] = dict.fromkeys(columns, 0)
+                report[span["name"]]["constraints"] = OrderedSet()
+            rule = report[span["name"]]
+            for column in columns:
+                rule[column] += span[column]
+            rule["constraints"].update(span["constraints"])
+        for rule in report.values():
+            rule["constraints"] = ", ".join(rule["constraints"])
+        report = pd.DataFrame.from_dict(
+            report, orient="index", columns=columns + ["constraints"]
+        )
+        report.index.name = "rule"
+        return report.sort_values("wall_time", ascending=False)
+
+    def write(self, path):
+        """Writes the spans to a json file.
+
+        :param path: path of the trace file
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def _start_span(self, name):
+        """Creates a span and stores the counters at its start.
+
+        :param name: name of the span
+        :return: dictionary of the span
+        """
+        if self.can_reset_peak_rss:
+            self._reset_peak_rss()
+        rss = self._get_rss()
+        return {
+            "name": name,
+            "children": [],
+            "_wall_start": time.perf_counter(),
+            "_cpu_start": time.process_time(),
+            "_rss_start": rss,
+            "_peak_rss": rss,
+        }
+
+    def _stop_span(self, record):
+        """Stores the wall time, CPU time and memory usage of a span.
+
+        :param record: dictionary of the span
+        :return: dictionary of the span
+        """
+        rss = self._get_rss()
+        record["wall_time"] = time.perf_counter() - record["_wall_start"]
+        record["cpu_time"] = time.process_time() - record["_cpu_start"]
+        record["rss_start"] = record["_rss_start"]
+        record["rss_end"] = rss
+        record["peak_rss"] = max(record["_peak_rss"], self._get_peak_rss(), rss)
+        return record
+
+    def _get_peak_rss(self):
+        """Returns the peak RSS of the process since the last reset.
+
+        :return: peak RSS in MB, the current RSS if the peak cannot be reset
+        """
+        if not self.can_reset_peak_rss:
+            return self._get_rss()
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+        return self._get_rss()
+
+    @staticmethod
+    def _get_rss():
+        """Returns the current RSS of the process.
+
+        :return: RSS in MB
+        """
+        return psutil.Process().memory_info().rss / 1024**2
+
+    @staticmethod
+    def _reset_peak_rss():
+        """Resets the peak RSS of the process, only possible on linux.
+
+        :return: True if the peak RSS was reset
+        """
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+        except OSError:
+            return False
+        return True
+
+
 class OptimizationError(RuntimeError):
     """Exception raised when the optimization problem is infeasible."""
 
@@ -0,0 +1,480 @@
+"""Synthetic datasets of scalable size and an end-to-end benchmark of ZEN-garden.
+
+The generated datasets contain nodes on a ring with additional random edges, one
+imported fuel and several demand carriers with hourly demand profiles, and
+conversion, storage and transport technologies for the demand carriers. The
+benchmark runs ZEN-garden with ``run_diagnostics`` on a grid of dataset sizes and
+reads the wall time and peak memory of each phase from ``trace.json``.
+"""
+
+import json
+import logging
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from zen_garden.runner import run
+
+logger = logging.getLogger(__name__)
+
+# phases of the trace that are reported by the benchmark
+BENCHMARK_PHASES = ["preprocess", "construct", "scaling", "solve", "postprocess"]
+
+DEFAULT_SIZE = {
+    "n_nodes": 4,
+    "n_edges": 8,
+    "n_conversion_technologies": 2,
+    "n_storage_technologies": 1,
+    "n_transport_technologies": 1,
+    "n_carriers": 2,
+    "n_years": 1,
+    "n_time_steps": 24,
+    "n_aggregated_time_steps": None,
+}
+
+
+def generate_dataset(
+    folder: Path | str,
+    n_nodes: int = 4,
+    n_edges: int = 8,
+    n_conversion_technologies: int = 2,
+    n_storage_technologies: int = 1,
+    n_transport_technologies: int = 1,
+    n_carriers: int = 2,
+    n_years: int = 1,
+    n_time_steps: int = 24,
+    n_aggregated_time_steps: int | None = None,
+    seed: int = 0,
+) -> Path:
+    """Writes a synthetic ZEN-garden dataset of the given size.
+
+    The first carrier is a fuel that can be imported at all nodes, the other
+    carriers have a demand at all nodes that can be shed at a high price, so that
+    the optimization problem is feasible for all sizes. The conversion technologies
+    convert the fuel into the demand carriers, every second one has an hourly
+    maximum load profile. The storage and transport technologies store and
+    transport the demand carriers.
+
+    Args:
+        folder (Path | str): Folder of the dataset, overwritten if it exists.
+        n_nodes (int): Number of nodes.
+        n_edges (int): Number of directed edges, at least the edges of a ring of
+            the nodes in both directions are created.
+        n_conversion_technologies (int): Number of conversion technologies.
+        n_storage_technologies (int): Number of storage technologies.
+        n_transport_technologies (int): Number of transport technologies.
+        n_carriers (int): Number of carriers including the fuel, at least 2.
+        n_years (int): Number of optimized years.
+        n_time_steps (int): Number of hourly time steps per year.
+        n_aggregated_time_steps (int | None): Number of time steps after the time
+            series aggregation. If None, the time series are not aggregated.
+        seed (int): Seed of the random profiles and edges.
+
+    Returns:
+        Path: Folder of the dataset.
+    """
+    if n_nodes < 2 or n_carriers < 2:
+        raise ValueError("A dataset needs at least 2 nodes and 2 carriers")
+    rng = np.random.default_rng(seed)
+    folder = Path(folder)
+    if folder.exists():
+        shutil.rmtree(folder)
+    nodes = [f"node_{i}" for i in range(n_nodes)]
+    fuel = "fuel"
+    carriers = [f"carrier_{i}" for i in range(n_carriers - 1)]
+    time = np.arange(n_time_steps)
+    conversion_technologies = [
+        f"conversion_{i}" for i in range(n_conversion_technologies)
+    ]
+    storage_technologies = [f"storage_{i}" for i in range(n_storage_technologies)]
+    transport_technologies = [f"transport_{i}" for i in range(n_transport_technologies)]
+
+    # system
+    system = {
+        "set_conversion_technologies": conversion_technologies,
+        "set_storage_technologies": storage_technologies,
+        "set_transport_technologies": transport_technologies,
+        "set_nodes": nodes,
+        "reference_year": 2022,
+        "unaggregated_time_steps_per_year": n_time_steps,
+        "aggregated_time_steps_per_year": n_aggregated_time_steps or n_time_steps,
+        "conduct_time_series_aggregation": n_aggregated_time_steps is not None,
+        "optimized_years": n_years,
+        "interval_between_years": 1,
+        "use_rolling_horizon": False,
+        "years_in_rolling_horizon": 1,
+    }
+    _write_json(folder / "system.json", system)
+
+    # energy system
+    energy_system = folder / "energy_system"
+    coordinates = pd.DataFrame(
+        {
+            "node": nodes,
+            "lon": rng.uniform(-10, 30, n_nodes).round(4),
+            "lat": rng.uniform(35, 65, n_nodes).round(4),
+        }
+    )
+    _write_csv(energy_system / "set_nodes.csv", coordinates)
+    edges = _generate_edges(n_nodes, n_edges, rng)
+    edges = pd.DataFrame(
+        {
+            "edge": [f"{nodes[i]}-{nodes[j]}" for i, j in edges],
+            "node_from": [nodes[i] for i, _ in edges],
+            "node_to": [nodes[j] for _, j in edges],
+        }
+    )
+    _write_csv(energy_system / "set_edges.csv", edges)
+    _write_json(
+        energy_system / "attributes.json",
+        {
+            "carbon_emissions_annual_limit": _attribute("inf", "gigatons"),
+            "carbon_emissions_budget": _attribute("inf", "gigatons"),
+            "carbon_emissions_cumulative_existing": _attribute(0.0, "gigatons"),
+            "price_carbon_emissions": _attribute(0.0, "Euro/tons"),
+            "price_carbon_emissions_budget_overshoot": _attribute(0.0, "Euro/tons"),
+            "price_carbon_emissions_annual_overshoot": _attribute(0.0, "Euro/tons"),
+            "knowledge_depreciation_rate": _attribute(0.1, "1"),
+            "knowledge_spillover_rate": _attribute(0.025, "1"),
+            "market_share_unbounded": _attribute(0.1, "1"),
+            "discount_rate": _attribute(0.06, "1"),
+        },
+    )
+    _write_json(
+        energy_system / "base_units.json",
+        {"unit": ["hour", "GW", "km", "megatons", "megaEuro"]},
+    )
+    (energy_system / "unit_definitions.txt").write_text(
+        "Euro = [currency] = EURO = Eur = €"
+    )
+
+    # carriers
+    for carrier in [fuel] + carriers:
+        is_fuel = carrier == fuel
+        _write_json(
+            folder / "set_carriers" / carrier / "attributes.json",
+            {
+                "carbon_intensity_carrier_import": _attribute(
+                    0.2 if is_fuel else 0.0, "kilotons/GWh"
+                ),
+                "carbon_intensity_carrier_export": _attribute(0.0, "kilotons/GWh"),
+                "demand": _attribute(0.0, "GW"),
+                "price_shed_demand": _attribute(
+                    "inf" if is_fuel else 1000.0, "kiloEuro/GWh"
+                ),
+                "availability_import": _attribute("inf" if is_fuel else 0.0, "GW"),
+                "availability_export": _attribute(0.0, "GW"),
+                "availability_import_yearly": _attribute("inf", "GWh"),
+                "availability_export_yearly": _attribute("inf", "GWh"),
+                "price_export": _attribute(0.0, "kiloEuro/GWh"),
+                "price_import": _attribute(30.0 if is_fuel else 0.0, "kiloEuro/GWh"),
+            },
+        )
+        if not is_fuel:
+            demand = _generate_profiles(time, nodes, rng, mean=10.0, amplitude=0.3)
+            _write_csv(folder / "set_carriers" / carrier / "demand.csv", demand)
+
+    # technologies
+    technology_folder = folder / "set_technologies"
+    for i, technology in enumerate(conversion_technologies):
+        carrier = carriers[i % len(carriers)]
+        attributes = _technology_attributes(carrier, lifetime=25.0)
+        attributes.update(
+            {
+                "input_carrier": {"default_value": [fuel]},
+                "output_carrier": {"default_value": [carrier]},
+                "conversion_factor": {fuel: _attribute(1.1, "GWh/GWh")},
+                "capex_specific_conversion": _attribute(
+                    round(float(rng.uniform(500, 1000)), 1), "Euro/kW"
+                ),
+            }
+        )
+        path = technology_folder / "set_conversion_technologies" / technology
+        _write_json(path / "attributes.json", attributes)
+        if i % 2 == 1:
+            max_load = _generate_profiles(time, nodes, rng, mean=0.5, amplitude=0.9)
+            _write_csv(path / "max_load.csv", max_load.clip(0, 1))
+    for i, technology in enumerate(storage_technologies):
+        attributes = _technology_attributes(carriers[i % len(carriers)], 50.0)
+        attributes.update(
+            {
+                "energy_to_power_ratio_min": _attribute(0, "h"),
+                "energy_to_power_ratio_max": _attribute("inf", "h"),
+                "efficiency_charge": _attribute(0.95, "1"),
+                "efficiency_discharge": _attribute(0.95, "1"),
+                "self_discharge": _attribute(0.0, "1"),
+                "capex_specific_storage": _attribute(100, "Euro/kW"),
+                "capacity_addition_min_energy": _attribute(0.0, "GWh"),
+                "capacity_addition_max_energy": _attribute("inf", "GWh"),
+                "capacity_existing_energy": _attribute(0.0, "GWh"),
+                "capacity_limit_energy": _attribute("inf", "GWh"),
+                "capacity_investment_existing_energy": _attribute(0.0, "GWh"),
+                "opex_specific_fixed_energy": _attribute(0.0, "kiloEuro/GWh"),
+                "capex_specific_storage_energy": _attribute(10, "Euro/kWh"),
+                "flow_storage_inflow": _attribute(0.0, "GW"),
+            }
+        )
+        path = technology_folder / "set_storage_technologies" / technology
+        _write_json(path / "attributes.json", attributes)
+    distance = _get_distances(coordinates, edges)
+    for i, technology in enumerate(transport_technologies):
+        attributes = _technology_attributes(carriers[i % len(carriers)], 50.0)
+        attributes["carbon_intensity_technology"] = _attribute(0.0, "kilotons/GWh/km")
+        attributes.update(
+            {
+                "transport_loss_factor_linear": _attribute(5e-05, "1/km"),
+                "capex_per_distance_transport": _attribute(265.0, "Euro/km/MW"),
+                "distance": _attribute("inf", "km"),
+            }
+        )
+        path = technology_folder / "set_transport_technologies" / technology
+        _write_json(path / "attributes.json", attributes)
+        _write_csv(path / "distance.csv", distance)
+    return folder
+
+
+def run_benchmark(
+    folder: Path | str,
+    sizes: list[dict],
+    baseline: Path | str | None = None,
+    tolerance: float = 0.25,
+    solver: str = "highs",
+) -> pd.DataFrame:
+    """Runs ZEN-garden on synthetic datasets of different sizes.
+
+    For each size, a dataset is generated and run with ``run_diagnostics``. The
+    wall time, CPU time and peak RSS of the phases preprocessing, construction,
+    scaling, solve and postprocessing are read from ``trace.json``. The results
+    are written to ``benchmark.csv`` in the folder.
+
+    Args:
+        folder (Path | str): Folder for the datasets, outputs and results.
+        sizes (list[dict]): Sizes of the datasets, each passed as keyword
+            arguments to ``generate_dataset``. Missing sizes are taken from
+            ``DEFAULT_SIZE``.
+        baseline (Path | str | None): Results of a previous benchmark to compare
+            against, see ``compare_to_baseline``.
+        tolerance (float): Relative slowdown or memory increase that is flagged as
+            a regression.
+        solver (str): Name of the solver.
+
+    Returns:
+        pd.DataFrame: Wall time, CPU time and peak RSS per dataset and phase. If a
+        baseline is given, the comparison to the baseline is included.
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    config = folder / "config.json"
+    _write_json(config, {"solver": {"name": solver, "run_diagnostics": True}})
+    results = []
+    for size in sizes:
+        size = {**DEFAULT_SIZE, **size}
+        name = "benchmark_" + "_".join(
+            str(size[key]) for key in DEFAULT_SIZE if key != "n_aggregated_time_steps"
+        )
+        if size["n_aggregated_time_steps"] is not None:
+            name += f"_tsa{size['n_aggregated_time_steps']}"
+        logger.info(f"Benchmark dataset {name}")
+        dataset = generate_dataset(folder / "datasets" / name, **size)
+        optimization_setup = run(
+            config=str(config),
+            dataset=str(dataset),
+            folder_output=str(folder / "outputs"),
+        )
+        with open(folder / "outputs" / name / "trace.json") as f:
+            trace = json.load(f)
+        spans = {span["name"]: span for span in trace["children"]}
+        # the construction and later phases are in the span of the horizon step
+        spans.update({span["name"]: span for span in spans["step_0"]["children"]})
+        for phase in BENCHMARK_PHASES:
+            results.append(
+                {
+                    "dataset": name,
+                    **size,
+                    "phase": phase,
+                    "wall_time": spans[phase]["wall_time"],
+                    "cpu_time": spans[phase]["cpu_time"],
+                    "peak_rss": spans[phase]["peak_rss"],
+                    "optimal": optimization_setup.optimality,
+                }
+            )
+    results = pd.DataFrame(results)
+    if baseline is not None:
+        results = compare_to_baseline(results, baseline, tolerance)
+    results.to_csv(folder / "benchmark.csv", index=False)
+    return results
+
+
+def compare_to_baseline(
+    results: pd.DataFrame, baseline: Path | str | pd.DataFrame, tolerance: float = 0.25
+) -> pd.DataFrame:
+    """Compares benchmark results to stored baseline results.
+
+    Args:
+        results (pd.DataFrame): Results of ``run_benchmark``.
+        baseline (Path | str | pd.DataFrame): Baseline results or the path of a
+            ``benchmark.csv`` file.
+        tolerance (float): Relative slowdown or memory increase that is flagged as
+            a regression.
+
+    Returns:
+        pd.DataFrame: The results with the ratios of the wall time and peak RSS to
+        the baseline and a column ``regression``. Datasets and phases that are not
+        in the baseline have no ratio.
+    """
+    if not isinstance(baseline, pd.DataFrame):
+        baseline = pd.read_csv(baseline)
+    baseline = baseline.set_index(["dataset", "phase"])[["wall_time", "peak_rss"]]
+    results = results.join(
+        baseline, on=["dataset", "phase"], rsuffix="_baseline", how="left"
+    )
+    results["wall_time_ratio"] = results["wall_time"] / results["wall_time_baseline"]
+    results["peak_rss_ratio"] = results["peak_rss"] / results["peak_rss_baseline"]
+    results["regression"] = (results["wall_time_ratio"] > 1 + tolerance) | (
+        results["peak_rss_ratio"] > 1 + tolerance
+    )
+    regressions = results[results["regression"]]
+    for _, row in regressions.iterrows():
+        logger.warning(
+            f"Regression in {row['dataset']}, phase {row['phase']}: wall time "
+            f"x{row['wall_time_ratio']:.2f}, peak RSS x{row['peak_rss_ratio']:.2f}"
+        )
+    return results
+
+
+def _generate_edges(n_nodes, n_edges, rng):
+    """Returns the directed edges of a ring of the nodes and random extra edges.
+
+    Args:
+        n_nodes (int): Number of nodes.
+        n_edges (int): Number of directed edges.
+        rng (np.random.Generator): Random number generator.
+
+    Returns:
+        list[tuple[int, int]]: Indices of the start and end node of the edges.
+    """
+    edges = []
+    for i in range(n_nodes if n_nodes > 2 else 1):
+        j = (i + 1) % n_nodes
+        edges += [(i, j), (j, i)]
+    candidates = [
+        (i, j)
+        for i in range(n_nodes)
+        for j in range(i + 1, n_nodes)
+        if (i, j) not in edges
+    ]
+    rng.shuffle(candidates)
+    for i, j in candidates[: max(0, (n_edges - len(edges)) // 2)]:
+        edges += [(i, j), (j, i)]
+    return edges
+
+
+def _generate_profiles(time, nodes, rng, mean, amplitude):
+    """Returns daily profiles with random noise for each node.
+
+    Args:
+        time (np.ndarray): Hourly time steps.
+        nodes (list[str]): Names of the nodes.
+        rng (np.random.Generator): Random number generator.
+        mean (float): Mean value of the profiles.
+        amplitude (float): Relative amplitude of the daily cycle.
+
+    Returns:
+        pd.DataFrame: Profiles with the time steps as index and the nodes as
+        columns.
+    """
+    phase = rng.uniform(0, 2 * np.pi, len(nodes))
+    daily = np.sin(2 * np.pi * time[:, None] / 24 + phase[None, :])
+    noise = rng.normal(0, 0.05, (len(time), len(nodes)))
+    profiles = mean * (1 + amplitude * daily + noise)
+    profiles = pd.DataFrame(profiles.round(4), index=time, columns=nodes)
+    profiles.index.name = "time"
+    return profiles
+
+
+def _get_distances(coordinates, edges):
+    """Returns the great-circle distance of the edges in km.
+
+    Args:
+        coordinates (pd.DataFrame): Longitude and latitude of the nodes.
+        edges (pd.DataFrame): Start and end node of the edges.
+
+    Returns:
+        pd.DataFrame: Distance of each edge.
+    """
+    coordinates = np.radians(coordinates.set_index("node")[["lon", "lat"]])
+    lon_from, lat_from = coordinates.loc[edges["node_from"]].values.T
+    lon_to, lat_to = coordinates.loc[edges["node_to"]].values.T
+    haversine = (
+        np.sin((lat_to - lat_from) / 2) ** 2
+        + np.cos(lat_from) * np.cos(lat_to) * np.sin((lon_to - lon_from) / 2) ** 2
+    )
+    distance = 2 * 6371 * np.arcsin(np.sqrt(haversine))
+    return pd.DataFrame({"edge": edges["edge"], "distance": distance.round(1)})
+
+
+def _technology_attributes(reference_carrier, lifetime):
+    """Returns the attributes that all technologies share.
+
+    Args:
+        reference_carrier (str): Reference carrier of the technology.
+        lifetime (float): Lifetime of the technology in years.
+
+    Returns:
+        dict: Attributes of the technology.
+    """
+    return {
+        "capacity_addition_min": _attribute(0.0, "GW"),
+        "capacity_addition_max": _attribute("inf", "GW"),
+        "capacity_existing": _attribute(0.0, "GW"),
+        "capacity_limit": _attribute("inf", "GW"),
+        "min_load": _attribute(0.0, "1"),
+        "max_load": _attribute(1.0, "1"),
+        "lifetime": _attribute(lifetime, "1"),
+        "opex_specific_variable": _attribute(0.0, "kiloEuro/GWh"),
+        "reference_carrier": {"default_value": [reference_carrier]},
+        "carbon_intensity_technology": _attribute(0.0, "kilotons/GWh"),
+        "construction_time": _attribute(0.0, "1"),
+        "capacity_investment_existing": _attribute(0.0, "GW"),
+        "opex_specific_fixed": _attribute(0.0, "kiloEuro/GW"),
+        "max_diffusion_rate": _attribute("inf", "1"),
+        "capacity_addition_unbounded": _attribute(0.0, "GW"),
+    }
+
+
+def _attribute(default_value, unit):
+    """Returns an attribute with a default value and a unit.
+
+    Args:
+        default_value (float | str): Default value of the attribute.
+        unit (str): Unit of the attribute.
+
+    Returns:
+        dict: The attribute.
+    """
+    return {"default_value": default_value, "unit": unit}
+
+
+def _write_json(path, data):
+    """Writes a dictionary to a json file and creates the folder.
+
+    Args:
+        path (Path): Path of the file.
+        data (dict): Data to write.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def _write_csv(path, data):
+    """Writes a data frame to a csv file and creates the folder.
+
+    Args:
+        path (Path): Path of the file.
+        data (pd.DataFrame): Data to write, the index is written if it is named.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data.to_csv(path, index=data.index.name is not None)